@@ -1,24 +1,22 @@
 from __future__ import annotations
 
 import base64
+import os
 from dataclasses import dataclass
 from io import BytesIO
 from pathlib import Path
-from typing import Dict, Iterable, cast
-
-from PIL import Image, ImageFilter, ImageStat
-
-try:
-	import pillow_heif  # type: ignore
-
-	pillow_heif.register_heif_opener()
-except Exception:
-	# HEIC support is optional; if not installed, HEIC files are skipped/unsupported.
-	pass
+from typing import Dict
 
+import numpy as np
+from PIL import Image
 
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".heic"}
 HASH_SIZE = 8
+HASH_ALGORITHMS = ("ahash", "dhash")
+DEFAULT_HASH_ALGO = "ahash"
+DRAFT_DECODE_TARGET = (1024, 1024)
+ENCODE_MAX_EDGE = 1280
+ENCODE_JPEG_QUALITY = 85
 MIN_SHORT_SIDE = 720
 DARK_PENALTY = 0.2
 LOW_RESOLUTION_PENALTY = 0.2
@@ -31,6 +29,30 @@ MIN_LOWER_EDGE_VARIANCE = 180.0
 MIN_STRONG_CENTER_VARIANCE = 140.0
 
 
+_HEIF_REGISTERED = False
+
+
+def _ensure_heif_registered() -> None:
+	"""Register the HEIF opener on first use; loading libheif at import is slow."""
+	global _HEIF_REGISTERED
+	if _HEIF_REGISTERED:
+		return
+	_HEIF_REGISTERED = True
+	try:
+		import pillow_heif  # type: ignore
+
+		pillow_heif.register_heif_opener()
+	except Exception:
+		# HEIC support is optional; if not installed, HEIC files are skipped/unsupported.
+		pass
+
+
+def _open_image(path: Path) -> Image.Image:
+	if path.suffix.lower() == ".heic":
+		_ensure_heif_registered()
+	return Image.open(path)
+
+
 @dataclass
 class ImageInfo:
 	width: int
@@ -38,42 +60,147 @@ class ImageInfo:
 	orientation: str
 
 
+@dataclass
+class ImageAnalysis:
+	info: ImageInfo
+	quality: Dict[str, float | bool]
+	image_hash: int
+	image_b64: str
+
+
 def collect_image_paths(input_dir: Path) -> list[Path]:
 	paths: list[Path] = []
-	for path in input_dir.rglob("*"):
-		if path.is_file() and path.suffix.lower() in IMAGE_EXTENSIONS:
-			paths.append(path)
+	stack = [str(input_dir)]
+	while stack:
+		with os.scandir(stack.pop()) as entries:
+			for entry in entries:
+				if entry.is_dir(follow_symlinks=False):
+					stack.append(entry.path)
+				elif entry.is_file(follow_symlinks=False):
+					name = entry.name
+					dot = name.rfind(".")
+					if dot != -1 and name[dot:].lower() in IMAGE_EXTENSIONS:
+						paths.append(Path(entry.path))
 	return paths
 
 
 def get_image_info(path: Path) -> ImageInfo:
-	with Image.open(path) as image:
+	with _open_image(path) as image:
 		width, height = image.size
-	orientation = _compute_orientation(width, height)
+	orientation = compute_orientation(width, height)
 	return ImageInfo(width=width, height=height, orientation=orientation)
 
 
-def encode_image_base64(path: Path) -> str:
-	with Image.open(path) as image:
-		output_format = _choose_output_format(path, image.format)
-		safe_image = image
-		if output_format == "JPEG" and image.mode in {"RGBA", "LA", "P"}:
-			safe_image = image.convert("RGB")
-
-		with BytesIO() as buffer:
-			safe_image.save(buffer, format=output_format)
-			return base64.b64encode(buffer.getvalue()).decode("ascii")
+def analyze_image(
+	path: Path,
+	max_edge: int | None = ENCODE_MAX_EDGE,
+	hash_algo: str = DEFAULT_HASH_ALGO,
+) -> ImageAnalysis:
+	"""Decode the image once and derive info, quality, hash, and base64 from it."""
+	with _open_image(path) as image:
+		width, height = image.size
+		_draft_downscale(image)
+		grayscale = image.convert("L")
+		image_b64 = _encode_to_base64(image, path, max_edge)
+
+	info = ImageInfo(
+		width=width,
+		height=height,
+		orientation=compute_orientation(width, height),
+	)
+	quality = _quality_from_grayscale(grayscale, width, height)
+	image_hash = _hash_from_grayscale(grayscale, HASH_SIZE, hash_algo)
+	return ImageAnalysis(
+		info=info,
+		quality=quality,
+		image_hash=image_hash,
+		image_b64=image_b64,
+	)
+
+
+def analyze_image_bytes(
+	data: bytes,
+	max_edge: int | None = ENCODE_MAX_EDGE,
+	hash_algo: str = DEFAULT_HASH_ALGO,
+) -> ImageAnalysis:
+	"""analyze_image for an already-encoded in-memory image (e.g. a piped frame)."""
+	with Image.open(BytesIO(data)) as image:
+		width, height = image.size
+		_draft_downscale(image)
+		grayscale = image.convert("L")
+		image_b64 = _encode_to_base64(image, None, max_edge)
+
+	info = ImageInfo(
+		width=width,
+		height=height,
+		orientation=compute_orientation(width, height),
+	)
+	quality = _quality_from_grayscale(grayscale, width, height)
+	image_hash = _hash_from_grayscale(grayscale, HASH_SIZE, hash_algo)
+	return ImageAnalysis(
+		info=info,
+		quality=quality,
+		image_hash=image_hash,
+		image_b64=image_b64,
+	)
+
+
+def encode_image_base64(path: Path, max_edge: int | None = ENCODE_MAX_EDGE) -> str:
+	with _open_image(path) as image:
+		return _encode_to_base64(image, path, max_edge)
+
+
+def _encode_to_base64(
+	image: Image.Image,
+	path: Path | None,
+	max_edge: int | None = ENCODE_MAX_EDGE,
+) -> str:
+	output_format = _choose_output_format(path, image)
+	safe_image = image
+	if output_format == "JPEG" and image.mode in {"RGBA", "LA", "P"}:
+		safe_image = image.convert("RGB")
+
+	if max_edge and max(safe_image.size) > max_edge:
+		if safe_image is image:
+			safe_image = image.copy()
+		safe_image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+	save_kwargs = {"quality": ENCODE_JPEG_QUALITY} if output_format == "JPEG" else {}
+	with BytesIO() as buffer:
+		safe_image.save(buffer, format=output_format, **save_kwargs)
+		return base64.b64encode(buffer.getbuffer()).decode("ascii")
 
 
 def analyze_quality(path: Path) -> Dict[str, float | bool]:
-	with Image.open(path) as image:
-		grayscale = image.convert("L")
-		stat = ImageStat.Stat(grayscale)
-		brightness = float(stat.mean[0])
+	with _open_image(path) as image:
 		width, height = image.size
-		edge_variance = _edge_variance(grayscale)
-		center_variance = _center_edge_variance(grayscale)
-		lower_variance = _lower_edge_variance(grayscale)
+		_draft_downscale(image)
+		grayscale = image.convert("L")
+	return _quality_from_grayscale(grayscale, width, height)
+
+
+def _quality_from_grayscale(
+	grayscale: Image.Image,
+	width: int,
+	height: int,
+) -> Dict[str, float | bool]:
+	gray = np.asarray(grayscale, dtype=np.int32)
+	brightness = float(gray.mean()) if gray.size else 0.0
+	edges = _edge_magnitude(gray)
+	edge_h, edge_w = edges.shape if edges.size else (0, 0)
+	edge_variance = _region_variance(edges)
+	center_variance = _region_variance(
+		edges[
+			int(edge_h * 0.25) : int(edge_h * 0.75),
+			int(edge_w * 0.25) : int(edge_w * 0.75),
+		]
+	)
+	lower_variance = _region_variance(
+		edges[
+			int(edge_h * 0.5) : int(edge_h * 0.95),
+			int(edge_w * 0.1) : int(edge_w * 0.9),
+		]
+	)
 
 	resolution = float(width * height)
 	dark = brightness < 50.0
@@ -98,26 +225,50 @@ def analyze_quality(path: Path) -> Dict[str, float | bool]:
 	}
 
 
-def compute_image_hash(path: Path, hash_size: int = HASH_SIZE) -> int:
-	with Image.open(path) as image:
+def compute_image_hash(
+	path: Path,
+	hash_size: int = HASH_SIZE,
+	algo: str = DEFAULT_HASH_ALGO,
+) -> int:
+	with _open_image(path) as image:
+		_draft_downscale(image)
 		grayscale = image.convert("L")
+	return _hash_from_grayscale(grayscale, hash_size, algo)
+
+
+def _draft_downscale(image: Image.Image) -> None:
+	"""Ask the decoder for a reduced-scale decode; a no-op for formats without draft.
+
+	All hash-producing paths must use the same target so hashes stay stable
+	across analyze_image, compute_image_hash, and the execution plan.
+	"""
+	try:
+		image.draft(None, DRAFT_DECODE_TARGET)
+	except Exception:
+		pass
+
+
+def _hash_from_grayscale(
+	grayscale: Image.Image,
+	hash_size: int,
+	algo: str = DEFAULT_HASH_ALGO,
+) -> int:
+	if algo not in HASH_ALGORITHMS:
+		raise ValueError(f"Unknown hash algorithm: {algo}")
+	if algo == "dhash":
+		resized = grayscale.resize(
+			(hash_size + 1, hash_size), Image.Resampling.BILINEAR
+		)
+		pixels = np.asarray(resized, dtype=np.int16)
+		bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+	else:
 		resized = grayscale.resize((hash_size, hash_size), Image.Resampling.BILINEAR)
-		pixels = list(_get_flattened_pixels(resized))
-	avg = sum(pixels) / len(pixels)
-
-	hash_value = 0
-	for idx, pixel in enumerate(pixels):
-		if pixel >= avg:
-			hash_value |= 1 << idx
-
-	return hash_value
-
-
-def _get_flattened_pixels(image: Image.Image) -> Iterable[int]:
-	get_flattened = getattr(image, "get_flattened_data", None)
-	if callable(get_flattened):
-		return cast(Iterable[int], get_flattened())
-	return cast(Iterable[int], image.getdata())
+		pixels = np.asarray(resized, dtype=np.uint8).ravel()
+		bits = pixels >= pixels.mean()
+	# packbits collapses the bit vector in one C pass; bit i keeps weight 2**i,
+	# so hashes are identical to the previous shift-multiply-sum encoding.
+	packed = np.packbits(bits, bitorder="little")
+	return int.from_bytes(packed.tobytes(), "little")
 
 
 def apply_quality_corrections(
@@ -145,7 +296,7 @@ def apply_quality_corrections(
 	return _clamp_score(score)
 
 
-def _compute_orientation(width: int, height: int) -> str:
+def compute_orientation(width: int, height: int) -> str:
 	if width == height:
 		return "square"
 	if width > height:
@@ -153,17 +304,20 @@ def _compute_orientation(width: int, height: int) -> str:
 	return "portrait"
 
 
-def _choose_output_format(path: Path, image_format: str | None) -> str:
-	if path.suffix.lower() == ".heic":
+def _choose_output_format(path: Path | None, image: Image.Image) -> str:
+	if path is not None and path.suffix.lower() == ".heic":
 		return "JPEG"
-	if image_format is None:
+	if image.format is None:
 		return "JPEG"
-	format_upper = image_format.upper()
-	if format_upper in {"JPEG", "JPG", "PNG"}:
-		return "PNG" if format_upper == "PNG" else "JPEG"
+	if image.format.upper() == "PNG" and _has_alpha(image):
+		return "PNG"
 	return "JPEG"
 
 
+def _has_alpha(image: Image.Image) -> bool:
+	return image.mode in {"RGBA", "LA", "PA"} or "transparency" in image.info
+
+
 def _clamp_score(score: float) -> float:
 	if score < 0.0:
 		return 0.0
@@ -172,27 +326,14 @@ def _clamp_score(score: float) -> float:
 	return float(score)
 
 
-def _edge_variance(grayscale: Image.Image) -> float:
-	edges = grayscale.filter(ImageFilter.FIND_EDGES)
-	edge_stat = ImageStat.Stat(edges)
-	return float(edge_stat.var[0])
-
+def _edge_magnitude(pixels: np.ndarray) -> np.ndarray:
+	"""Central-difference gradient magnitude, vectorized over the whole image."""
+	gx = pixels[:, 2:] - pixels[:, :-2]
+	gy = pixels[2:, :] - pixels[:-2, :]
+	return np.abs(gx[1:-1, :]) + np.abs(gy[:, 1:-1])
 
-def _center_edge_variance(grayscale: Image.Image) -> float:
-	width, height = grayscale.size
-	left = int(width * 0.25)
-	right = int(width * 0.75)
-	top = int(height * 0.25)
-	bottom = int(height * 0.75)
-	center = grayscale.crop((left, top, right, bottom))
-	return _edge_variance(center)
 
-
-def _lower_edge_variance(grayscale: Image.Image) -> float:
-	width, height = grayscale.size
-	left = int(width * 0.1)
-	right = int(width * 0.9)
-	top = int(height * 0.5)
-	bottom = int(height * 0.95)
-	lower = grayscale.crop((left, top, right, bottom))
-	return _edge_variance(lower)
+def _region_variance(edges: np.ndarray) -> float:
+	if edges.size == 0:
+		return 0.0
+	return float(edges.var())
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
-import audioop
 import os
 import subprocess
-import wave
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
+
 SPEECH_RMS_THRESHOLD = 0.02
 RMS_WINDOW_MS = 20
 RMS_ACTIVE_RATIO = 0.2
 VAD_SPEECH_RATIO = 0.15
 USE_WEBRTC_VAD_ENV = "USE_WEBRTC_VAD"
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_SAMPLE_WIDTH = 2
 
 try:
 	import webrtcvad  # type: ignore
@@ -29,47 +31,38 @@ class AudioAnalysis:
 
 def analyze_audio(
 	clip_path: Path,
-	temp_dir: Path,
 	use_vad: bool | None = None,
 ) -> AudioAnalysis:
-	temp_dir.mkdir(parents=True, exist_ok=True)
-	wav_path = temp_dir / f"{clip_path.stem}.wav"
-	_extract_audio(clip_path, wav_path)
-
-	with wave.open(str(wav_path), "rb") as audio_file:
-		sample_rate = audio_file.getframerate()
-		channels = audio_file.getnchannels()
-		sample_width = audio_file.getsampwidth()
-		n_frames = audio_file.getnframes()
-		if n_frames == 0:
-			return AudioAnalysis(has_speech=False, rms=0.0)
+	raw = _extract_audio(clip_path)
+	if not raw:
+		return AudioAnalysis(has_speech=False, rms=0.0)
 
-		if _should_use_vad(use_vad) and sample_rate in {8000, 16000, 32000, 48000}:
-			return _analyze_with_vad(audio_file, sample_rate)
+	if _should_use_vad(use_vad):
+		return _analyze_with_vad(raw, AUDIO_SAMPLE_RATE)
 
-		return _analyze_with_rms(audio_file, sample_rate, channels, sample_width)
+	return _analyze_with_rms(raw, AUDIO_SAMPLE_RATE)
 
 
-def _extract_audio(input_path: Path, output_path: Path) -> None:
+def _extract_audio(input_path: Path) -> bytes:
+	"""Decode the clip's audio to mono 16 kHz s16 PCM on stdout; no tempfile."""
 	command = [
 		"ffmpeg",
-		"-y",
 		"-i",
 		str(input_path),
 		"-vn",
 		"-ac",
 		"1",
 		"-ar",
-		"16000",
-		"-sample_fmt",
-		"s16",
+		str(AUDIO_SAMPLE_RATE),
 		"-f",
-		"wav",
-		str(output_path),
+		"s16le",
+		"pipe:1",
 	]
-	result = subprocess.run(command, capture_output=True, text=True, check=False)
+	result = subprocess.run(command, capture_output=True, check=False)
 	if result.returncode != 0:
-		raise RuntimeError(result.stderr.strip() or "ffmpeg audio extract failed")
+		stderr = result.stderr.decode("utf-8", errors="replace").strip()
+		raise RuntimeError(stderr or "ffmpeg audio extract failed")
+	return result.stdout
 
 
 def _should_use_vad(use_vad: bool | None) -> bool:
@@ -79,54 +72,44 @@ def _should_use_vad(use_vad: bool | None) -> bool:
 	return flag in {"1", "true", "yes"} and HAS_WEBRTC_VAD
 
 
-def _analyze_with_rms(
-	audio_file: wave.Wave_read,
-	sample_rate: int,
-	channels: int,
-	sample_width: int,
-) -> AudioAnalysis:
-	window_frames = max(int(sample_rate * RMS_WINDOW_MS / 1000), 1)
-	chunk_size = window_frames
-	max_possible = float((1 << (8 * sample_width - 1)) - 1)
-
-	rms_values: list[float] = []
-	above_threshold = 0
-	while True:
-		frames = audio_file.readframes(chunk_size)
-		if not frames:
-			break
-		rms = audioop.rms(frames, sample_width)
-		normalized = float(rms) / max_possible
-		rms_values.append(normalized)
-		if normalized >= SPEECH_RMS_THRESHOLD:
-			above_threshold += 1
-
-	if not rms_values:
+def _analyze_with_rms(raw: bytes, sample_rate: int) -> AudioAnalysis:
+	max_possible = float((1 << (8 * AUDIO_SAMPLE_WIDTH - 1)) - 1)
+	samples = np.frombuffer(raw, dtype=np.int16)
+	if samples.size == 0:
 		return AudioAnalysis(has_speech=False, rms=0.0)
 
-	mean_rms = sum(rms_values) / len(rms_values)
-	active_ratio = above_threshold / len(rms_values)
+	window_samples = max(int(sample_rate * RMS_WINDOW_MS / 1000), 1)
+	n_windows = samples.size // window_samples
+	if n_windows == 0:
+		windows = samples.reshape(1, -1).astype(np.float32)
+	else:
+		windows = (
+			samples[: n_windows * window_samples]
+			.reshape(n_windows, window_samples)
+			.astype(np.float32)
+		)
+
+	rms = np.sqrt((windows * windows).mean(axis=1)) / max_possible
+	mean_rms = float(rms.mean())
+	active_ratio = float((rms >= SPEECH_RMS_THRESHOLD).mean())
 	has_speech = active_ratio >= RMS_ACTIVE_RATIO
-	return AudioAnalysis(has_speech=has_speech, rms=float(mean_rms))
+	return AudioAnalysis(has_speech=has_speech, rms=mean_rms)
 
 
-def _analyze_with_vad(audio_file: wave.Wave_read, sample_rate: int) -> AudioAnalysis:
+def _analyze_with_vad(raw: bytes, sample_rate: int) -> AudioAnalysis:
 	if not HAS_WEBRTC_VAD:
 		return AudioAnalysis(has_speech=False, rms=0.0)
 
 	vad = webrtcvad.Vad(2)
 	window_frames = max(int(sample_rate * RMS_WINDOW_MS / 1000), 1)
-	bytes_per_frame = audio_file.getsampwidth() * audio_file.getnchannels()
+	bytes_per_window = window_frames * AUDIO_SAMPLE_WIDTH
 
 	speech_frames = 0
 	total_frames = 0
-	while True:
-		frames = audio_file.readframes(window_frames)
-		if not frames or len(frames) < window_frames * bytes_per_frame:
-			break
-		is_speech = vad.is_speech(frames, sample_rate)
+	for offset in range(0, len(raw) - bytes_per_window + 1, bytes_per_window):
+		frames = raw[offset : offset + bytes_per_window]
 		total_frames += 1
-		if is_speech:
+		if vad.is_speech(frames, sample_rate):
 			speech_frames += 1
 
 	if total_frames == 0:
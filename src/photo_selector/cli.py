@@ -5,24 +5,29 @@ import json
 import os
 import shutil
 import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
+
+try:
+	import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+	orjson = None  # type: ignore[assignment]
 
-from dotenv import load_dotenv
-from tqdm import tqdm
 
 from photo_selector.analyzer import (
-	analyze_quality,
+	DEFAULT_HASH_ALGO,
+	ENCODE_MAX_EDGE,
+	HASH_ALGORITHMS,
+	analyze_image,
 	apply_quality_corrections,
-	compute_image_hash,
 	collect_image_paths,
-	encode_image_base64,
-	get_image_info,
+	compute_orientation,
 )
 from photo_selector.dependency_check import DependencyError, validate_dependencies
 from photo_selector.execution_plan import build_execution_plan
-from photo_selector.log_utils import log_event
-from photo_selector.manifest import save_manifest
+from photo_selector.log_utils import dumps_pretty, log_event, make_progress
+from photo_selector.manifest import save_manifest_photos
 from photo_selector.ollama_client import OllamaClient
 from photo_selector.output_paths import get_photo_paths
 from photo_selector.resume_db import ScoreStore
@@ -43,9 +48,67 @@ SCHEMA_TEMPLATE = {
 	"score": 0.0,
 }
 
+OLLAMA_CONCURRENCY = 4
+COPY_WORKERS = 8
+
+
+def _analyze_local(
+	path: Path,
+	max_edge: int | None,
+	hash_algo: str = DEFAULT_HASH_ALGO,
+) -> Dict[str, Any]:
+	"""Run the CPU-bound per-image analysis. Must stay picklable for the pool."""
+	stat = path.stat()
+	analyzed = analyze_image(path, max_edge=max_edge, hash_algo=hash_algo)
+	return {
+		"width": analyzed.info.width,
+		"height": analyzed.info.height,
+		"orientation": analyzed.info.orientation,
+		"hash": f"{analyzed.image_hash:016x}",
+		"quality": analyzed.quality,
+		"image_b64": analyzed.image_b64,
+		"mtime_ns": stat.st_mtime_ns,
+		"size": stat.st_size,
+	}
+
+
+def _record_from_stat_cache(
+	path: Path,
+	score_store: ScoreStore,
+	hash_algo: str = DEFAULT_HASH_ALGO,
+) -> Dict[str, Any] | None:
+	"""Build a record from the stat-keyed cache without decoding the image."""
+	try:
+		stat = path.stat()
+		cached = score_store.get_by_stat(
+			str(path), stat.st_mtime_ns, stat.st_size, hash_algo=hash_algo
+		)
+	except OSError:
+		return None
+	if cached is None or cached.file_hash is None:
+		return None
+
+	analysis = cached.analysis or {"score": cached.score}
+	record: Dict[str, Any] = {
+		"path": str(path),
+		"hash": cached.file_hash,
+		"analysis": _validate_analysis(analysis),
+		"quality": cached.quality,
+		"error": None,
+	}
+	if cached.width is not None and cached.height is not None:
+		record.update(
+			{
+				"width": cached.width,
+				"height": cached.height,
+				"orientation": compute_orientation(cached.width, cached.height),
+			}
+		)
+	return record
+
 
 def main() -> int:
-	load_dotenv()
+	_load_dotenv_if_needed()
 	args = _parse_args()
 	try:
 		return _run(args)
@@ -69,6 +132,15 @@ def main() -> int:
 		return 1
 
 
+def _load_dotenv_if_needed() -> None:
+	"""Only pay for the dotenv filesystem scan when the env is not already set."""
+	if os.getenv("OLLAMA_MODEL") and os.getenv("OLLAMA_BASE_URL"):
+		return
+	from dotenv import load_dotenv
+
+	load_dotenv()
+
+
 def _run(args: argparse.Namespace) -> int:
 	_apply_config(args)
 	validate_dependencies(
@@ -90,7 +162,7 @@ def _run(args: argparse.Namespace) -> int:
 			resume=args.resume,
 			force=args.force,
 		)
-		print(json.dumps(plan, ensure_ascii=True, indent=2))
+		print(dumps_pretty(plan))
 		_summary_from_plan(args.log_format, plan, start_time)
 		return 0
 
@@ -102,47 +174,87 @@ def _run(args: argparse.Namespace) -> int:
 	image_paths = collect_image_paths(input_dir)
 	client = OllamaClient(base_url=args.ollama_base_url)
 
-	photos: list[Dict[str, Any]] = []
 	resume_enabled = bool(args.resume) and not bool(args.force)
 
+	records_by_path: dict[str, Dict[str, Any]] = {}
+	sidecar_path = paths.scores_dir / "photos.jsonl"
 	skipped = 0
-	for path in tqdm(image_paths, desc="Analyzing", unit="image"):
-		record: Dict[str, Any] = {
-			"path": str(path),
-		}
-		try:
-			info = get_image_info(path)
-			image_hash = compute_image_hash(path)
-			record.update(
-				{
-					"width": info.width,
-					"height": info.height,
-					"orientation": info.orientation,
-					"hash": f"{image_hash:016x}",
-				}
-			)
-
-			cached = None
+	progress = make_progress(
+		args.log_format, total=len(image_paths), desc="Analyzing", unit="image"
+	)
+	with sidecar_path.open("w", encoding="utf-8") as sidecar, ProcessPoolExecutor(
+		max_workers=os.cpu_count()
+	) as analysis_pool, ThreadPoolExecutor(
+		max_workers=args.ollama_concurrency
+	) as chat_pool, score_store.transaction():
+		analysis_futures: dict[Future, Path] = {}
+		for path in image_paths:
 			if resume_enabled:
-				cached = score_store.get(record["path"], record["hash"])
+				cached_record = _record_from_stat_cache(path, score_store, args.hash_algo)
+				if cached_record is not None:
+					_finalize_record(sidecar, records_by_path, cached_record)
+					skipped += 1
+					progress.update(1)
+					continue
+			analysis_futures[
+				analysis_pool.submit(_analyze_local, path, args.max_edge, args.hash_algo)
+			] = path
+		chat_futures: dict[Future, tuple[Dict[str, Any], Dict[str, Any]]] = {}
+
+		for future in as_completed(analysis_futures):
+			# Popping releases the Future (and its result dict) once consumed;
+			# as_completed snapshots the futures up front, so this is safe.
+			path = analysis_futures.pop(future)
+			record: Dict[str, Any] = {
+				"path": str(path),
+			}
+			try:
+				local = future.result()
+				record.update(
+					{
+						"width": local["width"],
+						"height": local["height"],
+						"orientation": local["orientation"],
+						"hash": local["hash"],
+					}
+				)
 
-			if cached is not None:
-				skipped += 1
-				analysis = cached.analysis or {"score": cached.score}
-				record["analysis"] = _validate_analysis(analysis)
-				record["quality"] = cached.quality
-				record["error"] = None
-			else:
-				quality = analyze_quality(path)
-				image_b64 = encode_image_base64(path)
-				prompt = _build_prompt(quality)
-				analysis = client.chat(args.model, image_b64, prompt)
-				analysis = _validate_analysis(analysis)
+				cached = None
+				if resume_enabled:
+					cached = score_store.get(record["path"], record["hash"])
+
+				if cached is not None:
+					skipped += 1
+					analysis = cached.analysis or {"score": cached.score}
+					record["analysis"] = _validate_analysis(analysis)
+					record["quality"] = cached.quality
+					record["error"] = None
+					_finalize_record(sidecar, records_by_path, record)
+					progress.update(1)
+				else:
+					prompt = _build_prompt(local["quality"])
+					# Pop the base64 payload so the local dict kept until the
+					# chat completes holds only the small metadata fields.
+					chat_future = chat_pool.submit(
+						client.chat, args.model, local.pop("image_b64"), prompt
+					)
+					chat_futures[chat_future] = (record, local)
+			except Exception as exc:  # noqa: BLE001
+				record["analysis"] = None
+				record["quality"] = None
+				record["error"] = str(exc)
+				_finalize_record(sidecar, records_by_path, record)
+				progress.update(1)
+
+		for future in as_completed(chat_futures):
+			record, local = chat_futures.pop(future)
+			try:
+				analysis = _validate_analysis(future.result())
 				analysis["score"] = apply_quality_corrections(
 					float(analysis["score"]),
-					quality,
-					info.width,
-					info.height,
+					local["quality"],
+					local["width"],
+					local["height"],
 				)
 				analysis["score"] = _apply_risk_penalties(
 					float(analysis["score"]),
@@ -150,21 +262,33 @@ def _run(args: argparse.Namespace) -> int:
 				)
 
 				record["analysis"] = analysis
-				record["quality"] = quality
+				record["quality"] = local["quality"]
 				record["error"] = None
 				score_store.upsert(
 					record["path"],
 					record["hash"],
 					float(analysis["score"]),
 					analysis,
-					quality,
+					local["quality"],
+					mtime_ns=local["mtime_ns"],
+					size=local["size"],
+					width=local["width"],
+					height=local["height"],
+					hash_algo=args.hash_algo,
 				)
-		except Exception as exc:  # noqa: BLE001
-			record["analysis"] = None
-			record["quality"] = None
-			record["error"] = str(exc)
-
-		photos.append(record)
+			except Exception as exc:  # noqa: BLE001
+				record["analysis"] = None
+				record["quality"] = None
+				record["error"] = str(exc)
+			_finalize_record(sidecar, records_by_path, record)
+			progress.update(1)
+	progress.close()
+
+	photos: list[Dict[str, Any]] = [
+		records_by_path[str(path)]
+		for path in image_paths
+		if str(path) in records_by_path
+	]
 
 	scored_photos = [
 		photo
@@ -198,20 +322,31 @@ def _run(args: argparse.Namespace) -> int:
 	)
 	selected_paths = {item["path"] for item in selected}
 
-	for record in photos:
-		record["selected"] = record.get("path") in selected_paths
+	copy_errors: dict[str, str] = {}
 
-	for record in selected:
+	def _stage_selected(record: Dict[str, Any]) -> None:
+		source = Path(record["path"])
+		destination = paths.selected_dir / source.name
 		try:
-			source = Path(record["path"])
-			destination = paths.selected_dir / source.name
-			shutil.copy2(source, destination)
+			_copy_or_link(source, destination)
 		except Exception as exc:  # noqa: BLE001
-			record["error"] = record.get("error") or str(exc)
-			record["selected"] = False
+			copy_errors[record["path"]] = str(exc)
+
+	with ThreadPoolExecutor(max_workers=COPY_WORKERS) as copy_pool:
+		list(copy_pool.map(_stage_selected, selected))
+
+	failed = 0
+
+	def _manifest_records() -> Iterator[Dict[str, Any]]:
+		nonlocal failed
+		for record in _stitch_manifest(
+			sidecar_path, image_paths, selected_paths, copy_errors
+		):
+			if record.get("error"):
+				failed += 1
+			yield record
 
-	save_manifest(paths.manifest_path, {"photos": photos})
-	failed = sum(1 for photo in photos if photo.get("error"))
+	save_manifest_photos(paths.manifest_path, _manifest_records())
 	processed = len(photos) - skipped
 	_summary(
 		args.log_format,
@@ -224,6 +359,66 @@ def _run(args: argparse.Namespace) -> int:
 	return 0
 
 
+def _copy_or_link(source: Path, destination: Path) -> None:
+	"""Hardlink when source and destination share a filesystem; else byte copy."""
+	try:
+		if destination.exists():
+			destination.unlink()
+		os.link(source, destination)
+	except OSError:
+		shutil.copy2(source, destination)
+
+
+def _finalize_record(
+	sidecar: Any,
+	records_by_path: dict[str, Dict[str, Any]],
+	record: Dict[str, Any],
+) -> None:
+	"""Stream the full record to the sidecar; keep only selection fields in memory."""
+	sidecar.write(json.dumps(record, ensure_ascii=True) + "\n")
+	records_by_path[record["path"]] = _minimal_record(record)
+
+
+def _minimal_record(record: Dict[str, Any]) -> Dict[str, Any]:
+	analysis = record.get("analysis")
+	score = analysis.get("score") if isinstance(analysis, dict) else None
+	return {
+		"path": record["path"],
+		"hash": record.get("hash"),
+		"analysis": {"score": score} if isinstance(score, (int, float)) else None,
+		"error": record.get("error"),
+	}
+
+
+def _stitch_manifest(
+	sidecar_path: Path,
+	image_paths: list[Path],
+	selected_paths: set[str],
+	copy_errors: dict[str, str],
+) -> Iterator[Dict[str, Any]]:
+	"""Re-read the sidecar and yield manifest records in input order."""
+	by_path: dict[str, Dict[str, Any]] = {}
+	with sidecar_path.open("r", encoding="utf-8") as handle:
+		for line in handle:
+			line = line.strip()
+			if not line:
+				continue
+			record = json.loads(line)
+			by_path[record["path"]] = record
+
+	for path in image_paths:
+		record = by_path.pop(str(path), None)
+		if record is None:
+			continue
+		copy_error = copy_errors.get(record["path"])
+		if copy_error is not None:
+			record["error"] = record.get("error") or copy_error
+			record["selected"] = False
+		else:
+			record["selected"] = record["path"] in selected_paths
+		yield record
+
+
 def _summary_from_plan(log_format: str, plan: Dict[str, Any], start_time: float) -> None:
 	files_to_process = plan.get("files_to_process") or []
 	files_to_skip = plan.get("files_to_skip") or []
@@ -262,45 +457,54 @@ def _summary(
 	)
 
 
+_PROMPT_PREFIX = (
+	"You are evaluating a photo for a child's growth memory slideshow. "
+	"Return ONLY JSON. Do NOT output anything else. "
+	"No extra text, no explanations, no markdown. "
+	"The JSON MUST match this schema exactly, with no extra keys: "
+	f"{json.dumps(SCHEMA_TEMPLATE, ensure_ascii=True)} "
+	"Tags must be at most 5 items, all lowercase snake_case English words. "
+	"Caption must be short Japanese (15-25 characters). "
+	"Score must be between 0.0 and 1.0. "
+	"If the image is inappropriate or cannot be judged, still return JSON with a low score. "
+	"Background blur is acceptable. Focus on whether the subject looks sharp. "
+	"Set risks.blur true when the subject or hands show motion blur. "
+	"Set risks.out_of_focus true when the subject is not in focus. "
+	"Consider the provided quality hints, including center and lower-area sharpness and exposure. "
+	"Quality hints: "
+)
+
+
 def _build_prompt(quality: Dict[str, float | bool]) -> str:
-	return (
-		"You are evaluating a photo for a child's growth memory slideshow. "
-		"Return ONLY JSON. Do NOT output anything else. "
-		"No extra text, no explanations, no markdown. "
-		"The JSON MUST match this schema exactly, with no extra keys: "
-		f"{json.dumps(SCHEMA_TEMPLATE, ensure_ascii=True)} "
-		"Tags must be at most 5 items, all lowercase snake_case English words. "
-		"Caption must be short Japanese (15-25 characters). "
-		"Score must be between 0.0 and 1.0. "
-		"If the image is inappropriate or cannot be judged, still return JSON with a low score. "
-		"Background blur is acceptable. Focus on whether the subject looks sharp. "
-		"Set risks.blur true when the subject or hands show motion blur. "
-		"Set risks.out_of_focus true when the subject is not in focus. "
-		"Consider the provided quality hints, including center and lower-area sharpness and exposure. "
-		f"Quality hints: {json.dumps(quality, ensure_ascii=True)}"
-	)
+	# Only the quality hints vary per photo; the prefix (schema included) is
+	# serialized once at import time.
+	if orjson is not None:
+		return _PROMPT_PREFIX + orjson.dumps(quality).decode("utf-8")
+	return _PROMPT_PREFIX + json.dumps(quality, ensure_ascii=True)
 
 
 def _validate_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
 	return normalize_analysis(analysis)
 
 
+# Risk weights with the 0.5 penalty scale pre-applied.
+RISK_PENALTIES = (
+	("blur", 0.125),
+	("out_of_focus", 0.125),
+	("dark", 0.075),
+	("overexposed", 0.075),
+)
+
+
 def _apply_risk_penalties(score: float, risks: Dict[str, Any]) -> float:
-	penalty_scale = 0.5
-	if bool(risks.get("blur")):
-		score -= 0.25 * penalty_scale
-	if bool(risks.get("out_of_focus")):
-		score -= 0.25 * penalty_scale
-	if bool(risks.get("dark")):
-		score -= 0.15 * penalty_scale
-	if bool(risks.get("overexposed")):
-		score -= 0.15 * penalty_scale
-
-	if score < 0.0:
-		return 0.0
-	if score > 1.0:
-		return 1.0
-	return float(score)
+	return min(
+		1.0,
+		max(
+			0.0,
+			score
+			- sum(weight for key, weight in RISK_PENALTIES if risks.get(key)),
+		),
+	)
 
 
 def _parse_args() -> argparse.Namespace:
@@ -314,6 +518,18 @@ def _parse_args() -> argparse.Namespace:
 	parser.add_argument("--no-photo-dedupe", dest="photo_dedupe", action="store_false")
 	parser.set_defaults(photo_dedupe=None)
 	parser.add_argument("--photo-dedupe-hamming-threshold", type=int)
+	parser.add_argument(
+		"--max-edge",
+		type=int,
+		default=ENCODE_MAX_EDGE,
+		help="Longest edge for images sent to the model; 0 disables downscaling",
+	)
+	parser.add_argument(
+		"--hash-algo",
+		choices=list(HASH_ALGORITHMS),
+		default=DEFAULT_HASH_ALGO,
+		help="Perceptual hash used for near-duplicate detection",
+	)
 	parser.add_argument(
 		"--dry-run",
 		action="store_true",
@@ -345,6 +561,12 @@ def _parse_args() -> argparse.Namespace:
 		default=os.getenv("OLLAMA_BASE_URL") or "http://localhost:11434",
 		help="Ollama base URL",
 	)
+	parser.add_argument(
+		"--ollama-concurrency",
+		type=int,
+		default=OLLAMA_CONCURRENCY,
+		help="Number of in-flight Ollama requests",
+	)
 	return parser.parse_args()
 
 
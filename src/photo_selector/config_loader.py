@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from pathlib import Path
 from typing import Any
 
@@ -7,7 +8,17 @@ from typing import Any
 def load_config(path: Path) -> dict[str, Any]:
 	if not path.exists():
 		raise FileNotFoundError(f"Config file not found: {path}")
+	stat = path.stat()
+	return dict(_load_config_cached(str(path), stat.st_mtime_ns, stat.st_size))
 
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(
+	path_str: str,
+	mtime_ns: int,
+	size: int,
+) -> dict[str, Any]:
+	"""Parse the YAML once per (path, stat); repeat loads skip the parse."""
 	try:
 		import yaml  # type: ignore
 	except Exception as exc:  # noqa: BLE001
@@ -15,7 +26,7 @@ def load_config(path: Path) -> dict[str, Any]:
 			"PyYAML is required for --config. Install with: pip install pyyaml"
 		) from exc
 
-	data = yaml.safe_load(path.read_text(encoding="utf-8"))
+	data = yaml.safe_load(Path(path_str).read_text(encoding="utf-8"))
 	if data is None:
 		return {}
 	if not isinstance(data, dict):
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Sequence
+
+import numpy as np
 
 
 def hash_to_int(value: Any) -> int | None:
@@ -18,8 +20,65 @@ def hamming_distance(left: int, right: int) -> int:
 	return (left ^ right).bit_count()
 
 
-def is_near_duplicate(candidate: int, selected: list[int], threshold: int) -> bool:
-	for existing in selected:
-		if hamming_distance(candidate, existing) <= threshold:
-			return True
-	return False
+# numpy >= 2 maps bitwise_count straight onto the hardware popcount.
+_HAS_BITWISE_COUNT = hasattr(np, "bitwise_count")
+
+
+def hamming_distances(candidate: int, hashes: np.ndarray) -> np.ndarray:
+	"""Hamming distance from candidate to every hash, in one vectorized pass."""
+	xor = np.bitwise_xor(hashes, np.uint64(candidate))
+	if _HAS_BITWISE_COUNT:
+		return np.bitwise_count(xor)
+	bits = np.unpackbits(xor.view(np.uint8))
+	return bits.reshape(hashes.size, 8 * hashes.itemsize).sum(axis=1)
+
+
+class HammingIndex:
+	"""Near-duplicate lookup via multi-index hashing.
+
+	The hash is split into ``threshold + 1`` bit chunks; by pigeonhole, two
+	hashes within the threshold must agree exactly on at least one chunk, so
+	only hashes colliding in some chunk bucket need the exact distance check.
+	"""
+
+	def __init__(self, threshold: int, hash_bits: int = 64) -> None:
+		self._threshold = threshold
+		chunk_count = max(1, min(hash_bits, threshold + 1))
+		base_width = hash_bits // chunk_count
+		extra = hash_bits % chunk_count
+		self._chunks: list[tuple[int, int]] = []
+		shift = 0
+		for index in range(chunk_count):
+			width = base_width + (1 if index < extra else 0)
+			self._chunks.append((shift, (1 << width) - 1))
+			shift += width
+		self._buckets: list[dict[int, list[int]]] = [{} for _ in self._chunks]
+
+	def add(self, value: int) -> None:
+		for bucket, (shift, mask) in zip(self._buckets, self._chunks):
+			bucket.setdefault((value >> shift) & mask, []).append(value)
+
+	def within(self, value: int, threshold: int | None = None) -> bool:
+		if threshold is None:
+			threshold = self._threshold
+		candidates: set[int] = set()
+		for bucket, (shift, mask) in zip(self._buckets, self._chunks):
+			candidates.update(bucket.get((value >> shift) & mask, ()))
+		if not candidates:
+			return False
+		hashes = np.fromiter(candidates, dtype=np.uint64, count=len(candidates))
+		return bool((hamming_distances(value, hashes) <= threshold).any())
+
+
+def is_near_duplicate(
+	candidate: int,
+	selected: Sequence[int] | np.ndarray,
+	threshold: int,
+) -> bool:
+	if len(selected) == 0:
+		return False
+	if isinstance(selected, np.ndarray):
+		hashes = selected
+	else:
+		hashes = np.asarray(selected, dtype=np.uint64)
+	return bool((hamming_distances(candidate, hashes) <= threshold).any())
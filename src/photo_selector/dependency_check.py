@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import shutil
 import subprocess
 from dataclasses import dataclass
@@ -46,10 +47,14 @@ def validate_dependencies(
 	)
 
 
+# The checks are process-invariant (PATH, ffmpeg build, server liveness at
+# startup), so pay the subprocess / HTTP cost once per process.
+@functools.lru_cache(maxsize=None)
 def _check_ffmpeg() -> bool:
 	return shutil.which("ffmpeg") is not None
 
 
+@functools.lru_cache(maxsize=None)
 def _check_nvenc() -> bool:
 	command = ["ffmpeg", "-hide_banner", "-encoders"]
 	result = subprocess.run(command, capture_output=True, text=True, check=False)
@@ -58,10 +63,22 @@ def _check_nvenc() -> bool:
 	return "h264_nvenc" in result.stdout
 
 
+@functools.lru_cache(maxsize=None)
 def _check_ollama(base_url: str) -> bool:
 	url = f"{base_url.rstrip('/')}/api/tags"
 	try:
-		response = requests.get(url, timeout=3)
+		response = _session().get(url, timeout=3)
 		return response.status_code == 200
 	except Exception:
 		return False
+
+
+_SESSION: requests.Session | None = None
+
+
+def _session() -> requests.Session:
+	"""Reuse one keep-alive session instead of a fresh connection per check."""
+	global _SESSION
+	if _SESSION is None:
+		_SESSION = requests.Session()
+	return _SESSION
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Iterable
 
@@ -57,15 +59,28 @@ def _build_photo_plan(
 	files_to_process: list[str] = []
 	files_to_skip: list[str] = []
 
+	pending: list[Path] = []
 	for path in image_paths:
-		file_hash = compute_image_hash(path)
-		hex_hash = f"{file_hash:016x}"
-		if resume_enabled and score_store is not None:
-			cached = score_store.get(str(path), hex_hash)
-			if cached is not None:
-				files_to_skip.append(str(path))
-				continue
-		files_to_process.append(str(path))
+		if resume_enabled and score_store is not None and _stat_cache_hit(
+			path, score_store
+		):
+			files_to_skip.append(str(path))
+			continue
+		pending.append(path)
+
+	if resume_enabled and score_store is not None and pending:
+		pairs = [
+			(str(path), f"{file_hash:016x}")
+			for path, file_hash in zip(pending, _compute_hashes(pending))
+		]
+		present = score_store.get_many(pairs)
+		for pair in pairs:
+			if pair in present:
+				files_to_skip.append(pair[0])
+			else:
+				files_to_process.append(pair[0])
+	else:
+		files_to_process.extend(str(path) for path in pending)
 
 	estimated_outputs: list[str] = [
 		str(paths.scores_dir),
@@ -86,6 +101,26 @@ def _build_photo_plan(
 	}
 
 
+def _stat_cache_hit(path: Path, score_store: ScoreStore) -> bool:
+	"""Check the resume cache by file stat, without decoding the image."""
+	try:
+		stat = path.stat()
+	except OSError:
+		return False
+	return (
+		score_store.get_by_stat(str(path), stat.st_mtime_ns, stat.st_size)
+		is not None
+	)
+
+
+def _compute_hashes(paths: list[Path]) -> list[int]:
+	"""Hash stat-cache misses in parallel; decode dominates per-file cost."""
+	if len(paths) < 8:
+		return [compute_image_hash(path) for path in paths]
+	with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+		return list(pool.map(compute_image_hash, paths, chunksize=32))
+
+
 def _build_video_plan(
 	*,
 	input_path: Path,
@@ -29,3 +29,68 @@ def extract_representative_frame(clip_path: Path, output_path: Path) -> Path:
 		raise RuntimeError(result.stderr.strip() or "ffmpeg frame extract failed")
 
 	return output_path
+
+
+def extract_representative_frames_batch(
+	source_path: Path,
+	timestamps: list[float],
+) -> list[bytes]:
+	"""Extract one JPEG frame per timestamp with a single ffmpeg process.
+
+	All frames arrive as one MJPEG stream on stdout and are split on the
+	JPEG SOI/EOI markers, so N clips cost one process spawn instead of N.
+	Returns the frames in ascending timestamp order, never touching disk.
+	"""
+	if not timestamps:
+		return []
+
+	ordered = sorted(timestamps)
+	# Pick the first frame at or after each timestamp, at most once per timestamp.
+	terms = [
+		f"gte(t\\,{timestamp:.3f})*if(isnan(prev_selected_t)\\,1\\,lt(prev_selected_t\\,{timestamp:.3f}))"
+		for timestamp in ordered
+	]
+	command = [
+		"ffmpeg",
+		"-y",
+		"-i",
+		str(source_path),
+		"-vf",
+		f"select={'+'.join(terms)}",
+		"-vsync",
+		"0",
+		"-f",
+		"image2pipe",
+		"-vcodec",
+		"mjpeg",
+		"-q:v",
+		"2",
+		"-",
+	]
+	result = subprocess.run(command, capture_output=True, check=False)
+	if result.returncode != 0:
+		message = result.stderr.decode("utf-8", "replace").strip()
+		raise RuntimeError(message or "ffmpeg frame extract failed")
+
+	frames = _split_mjpeg_stream(result.stdout)
+	if len(frames) != len(ordered):
+		raise RuntimeError(
+			f"expected {len(ordered)} frames, ffmpeg produced {len(frames)}"
+		)
+	return frames
+
+
+def _split_mjpeg_stream(data: bytes) -> list[bytes]:
+	"""Split a concatenated MJPEG byte stream on the JPEG SOI/EOI markers."""
+	frames: list[bytes] = []
+	cursor = 0
+	while True:
+		start = data.find(b"\xff\xd8", cursor)
+		if start < 0:
+			break
+		end = data.find(b"\xff\xd9", start + 2)
+		if end < 0:
+			break
+		frames.append(data[start : end + 2])
+		cursor = end + 2
+	return frames
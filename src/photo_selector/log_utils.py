@@ -1,12 +1,69 @@
 from __future__ import annotations
 
 import json
+import sys
+import time
 from datetime import datetime, timezone
 from typing import Any, Dict
 
+from tqdm import tqdm
+
+try:
+	import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+	orjson = None  # type: ignore[assignment]
+
 
 LogFormat = str
 
+_last_timestamp_second = 0
+_last_timestamp = ""
+
+
+def make_progress(
+	log_format: LogFormat,
+	iterable: Any = None,
+	*,
+	total: int | None = None,
+	desc: str,
+	unit: str,
+) -> tqdm:
+	"""Progress bar tuned for batch runs.
+
+	Linear-average ETA (smoothing=0) suits variable-latency model calls, a
+	half-second refresh floor avoids redraw overhead on cache-hit runs, and
+	the bar is disabled for JSON logs and non-TTY output.
+	"""
+	return tqdm(
+		iterable,
+		total=total,
+		desc=desc,
+		unit=unit,
+		smoothing=0,
+		mininterval=0.5,
+		dynamic_ncols=True,
+		disable=log_format == "json" or not sys.stderr.isatty(),
+	)
+
+
+def dumps_pretty(data: Any) -> str:
+	"""Indented JSON for human-facing output, via orjson when available."""
+	if orjson is not None:
+		return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+	return json.dumps(data, ensure_ascii=True, indent=2)
+
+
+def _utc_timestamp() -> str:
+	"""Timestamp at second precision, reformatted only when the second changes."""
+	global _last_timestamp_second, _last_timestamp
+	now = int(time.time())
+	if now != _last_timestamp_second or not _last_timestamp:
+		_last_timestamp_second = now
+		_last_timestamp = datetime.fromtimestamp(now, timezone.utc).isoformat(
+			timespec="seconds"
+		)
+	return _last_timestamp
+
 
 def log_event(
 	log_format: LogFormat,
@@ -17,9 +74,8 @@ def log_event(
 	file_path: str | None = None,
 	extra: Dict[str, Any] | None = None,
 ) -> None:
-	timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
 	payload: Dict[str, Any] = {
-		"timestamp": timestamp,
+		"timestamp": _utc_timestamp(),
 		"level": level,
 		"event_type": event_type,
 		"file_path": file_path,
@@ -29,7 +85,10 @@ def log_event(
 		payload.update(extra)
 
 	if log_format == "json":
-		print(json.dumps(payload, ensure_ascii=True))
+		if orjson is not None:
+			print(orjson.dumps(payload).decode("utf-8"))
+		else:
+			print(json.dumps(payload, ensure_ascii=True))
 		return
 
 	message_parts = [f"{level.upper()}: {message}"]
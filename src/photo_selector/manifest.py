@@ -2,7 +2,12 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
+
+try:
+	import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+	orjson = None  # type: ignore[assignment]
 
 
 def load_manifest(path: Path) -> Dict[str, Any]:
@@ -14,5 +19,32 @@ def load_manifest(path: Path) -> Dict[str, Any]:
 
 def save_manifest(path: Path, data: Dict[str, Any]) -> None:
 	path.parent.mkdir(parents=True, exist_ok=True)
+	if orjson is not None:
+		path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+		return
 	with path.open("w", encoding="utf-8") as handle:
 		json.dump(data, handle, ensure_ascii=True, indent=2)
+
+
+def save_manifest_photos(path: Path, photos: Iterable[Dict[str, Any]]) -> None:
+	"""Write the photo manifest one record at a time.
+
+	Serializing records individually keeps memory flat for large libraries,
+	where a single json.dump of the full photo list would buffer everything.
+	"""
+	path.parent.mkdir(parents=True, exist_ok=True)
+	with path.open("w", encoding="utf-8") as handle:
+		handle.write('{\n  "photos": [\n')
+		first = True
+		for record in photos:
+			if not first:
+				handle.write(",\n")
+			first = False
+			handle.write("    " + _dumps_record(record))
+		handle.write("\n  ]\n}\n")
+
+
+def _dumps_record(record: Dict[str, Any]) -> str:
+	if orjson is not None:
+		return orjson.dumps(record).decode("utf-8")
+	return json.dumps(record, ensure_ascii=True)
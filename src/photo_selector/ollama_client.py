@@ -2,10 +2,31 @@ from __future__ import annotations
 
 import json
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+	import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+	orjson = None  # type: ignore[assignment]
+
+CONNECTION_POOL_SIZE = 16
+DEFAULT_SYSTEM_PROMPT = "You are a photo selection assistant. Return only JSON."
+
+
+def _make_session() -> requests.Session:
+	"""Session with a keep-alive pool sized for concurrent chat calls."""
+	session = requests.Session()
+	adapter = HTTPAdapter(
+		pool_connections=CONNECTION_POOL_SIZE,
+		pool_maxsize=CONNECTION_POOL_SIZE,
+	)
+	session.mount("http://", adapter)
+	session.mount("https://", adapter)
+	return session
 
 
 @dataclass
@@ -14,8 +35,17 @@ class OllamaClient:
 	timeout_seconds: int = 30
 	max_retries: int = 2
 	retry_backoff_seconds: float = 0.8
+	_session: requests.Session = field(default_factory=_make_session, repr=False)
 
-	def chat(self, model: str, image_b64: str, prompt: str) -> Dict[str, Any]:
+	def chat(
+		self,
+		model: str,
+		image_b64: str,
+		prompt: str,
+		*,
+		system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+		options: Dict[str, Any] | None = None,
+	) -> Dict[str, Any]:
 		url = f"{self.base_url.rstrip('/')}/api/chat"
 		payload = {
 			"model": model,
@@ -23,7 +53,7 @@ class OllamaClient:
 			"messages": [
 				{
 					"role": "system",
-					"content": "You are a photo selection assistant. Return only JSON.",
+					"content": system_prompt,
 				},
 				{
 					"role": "user",
@@ -32,11 +62,25 @@ class OllamaClient:
 				},
 			],
 		}
+		if options:
+			payload["options"] = options
+
+		# Serialize once so retries and requests reuse the same body bytes
+		# instead of re-encoding the base64 image per attempt. orjson writes
+		# straight to bytes, skipping the intermediate str the stdlib builds
+		# for the multi-megabyte base64 payload.
+		if orjson is not None:
+			body = orjson.dumps(payload)
+		else:
+			body = json.dumps(payload, ensure_ascii=True).encode("utf-8")
+		headers = {"Content-Type": "application/json"}
 
 		last_error: Exception | None = None
 		for attempt in range(self.max_retries + 1):
 			try:
-				response = requests.post(url, json=payload, timeout=self.timeout_seconds)
+				response = self._session.post(
+					url, data=body, headers=headers, timeout=self.timeout_seconds
+				)
 				if response.status_code != 200:
 					raise RuntimeError(
 						f"Ollama HTTP {response.status_code}: {response.text[:200]}"
@@ -59,6 +103,16 @@ class OllamaClient:
 
 
 def _parse_json_from_text(text: str) -> Dict[str, Any]:
+	# Clean JSON is the common case; parse it directly and only fall back to
+	# the fence-stripping heuristics when that fails.
+	try:
+		parsed = json.loads(text)
+	except json.JSONDecodeError:
+		pass
+	else:
+		if isinstance(parsed, dict):
+			return parsed
+
 	stripped = text.strip()
 	if stripped.startswith("```"):
 		stripped = stripped.strip("`")
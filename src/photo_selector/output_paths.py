@@ -54,3 +54,11 @@ def final_digest_path(paths: VideoOutputPaths, source_stem: str) -> Path:
 
 def concat_list_path(paths: VideoOutputPaths, label: str) -> Path:
 	return paths.temp_dir / "concat" / f"{label}.txt"
+
+
+def analysis_cache_dir(paths: VideoOutputPaths) -> Path:
+	return paths.output_dir / ".cache" / "analysis"
+
+
+def video_scores_db_path(paths: VideoOutputPaths) -> Path:
+	return paths.scores_dir / "video_scores.sqlite"
@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import json
 import sqlite3
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator
+
+try:
+	import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+	orjson = None  # type: ignore[assignment]
 
 
 @dataclass
@@ -13,15 +19,88 @@ class CachedScore:
 	score: float
 	analysis: Dict[str, Any] | None
 	quality: Dict[str, Any] | None
+	file_hash: str | None = None
+	width: int | None = None
+	height: int | None = None
+
+
+BATCH_COMMIT_INTERVAL = 64
+
+_UPSERT_SQL = """
+	INSERT INTO photo_scores (
+		file_path,
+		file_hash,
+		score,
+		analysis_json,
+		quality_json,
+		last_processed_at,
+		mtime_ns,
+		size,
+		width,
+		height,
+		hash_algo
+	)
+	VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+	ON CONFLICT(file_path) DO UPDATE SET
+		file_hash = excluded.file_hash,
+		score = excluded.score,
+		analysis_json = excluded.analysis_json,
+		quality_json = excluded.quality_json,
+		last_processed_at = excluded.last_processed_at,
+		mtime_ns = excluded.mtime_ns,
+		size = excluded.size,
+		width = excluded.width,
+		height = excluded.height,
+		hash_algo = excluded.hash_algo
+"""
 
 
 class ScoreStore:
 	def __init__(self, db_path: Path, create: bool = True) -> None:
 		self._db_path = db_path
 		self._create = create
+		self._connection: sqlite3.Connection | None = None
+		self._in_batch = False
+		self._pending_writes = 0
 		if create:
 			self._init_db()
 
+	def _connect(self) -> sqlite3.Connection:
+		if self._connection is None:
+			connection = sqlite3.connect(
+				self._db_path,
+				isolation_level=None,
+				check_same_thread=False,
+			)
+			connection.execute("PRAGMA journal_mode=WAL")
+			connection.execute("PRAGMA synchronous=NORMAL")
+			connection.execute("PRAGMA cache_size=-65536")
+			connection.execute("PRAGMA temp_store=MEMORY")
+			self._connection = connection
+		return self._connection
+
+	def close(self) -> None:
+		if self._connection is not None:
+			self._connection.close()
+			self._connection = None
+
+	@contextmanager
+	def transaction(self) -> Iterator[ScoreStore]:
+		"""Batch upserts into one transaction, committing every few writes."""
+		connection = self._connect()
+		connection.execute("BEGIN")
+		self._in_batch = True
+		self._pending_writes = 0
+		try:
+			yield self
+			connection.commit()
+		except BaseException:
+			connection.rollback()
+			raise
+		finally:
+			self._in_batch = False
+			self._pending_writes = 0
+
 	def get(self, file_path: str, file_hash: str) -> CachedScore | None:
 		if not self._db_path.exists():
 			return None
@@ -33,9 +112,55 @@ class ScoreStore:
 		if stored_hash != file_hash:
 			return None
 
-		analysis = self._load_json(row[3])
-		quality = self._load_json(row[4])
-		return CachedScore(score=float(row[2]), analysis=analysis, quality=quality)
+		return self._cached_score_from_row(row)
+
+	def get_many(self, pairs: list[tuple[str, str]]) -> set[tuple[str, str]]:
+		"""Return the (file_path, file_hash) pairs already stored.
+
+		One SELECT per 500 paths instead of one per file; the caller
+		classifies hits and misses locally.
+		"""
+		if not pairs or not self._db_path.exists():
+			return set()
+		connection = self._connect()
+		wanted = set(pairs)
+		present: set[tuple[str, str]] = set()
+		paths = [path for path, _ in pairs]
+		for start in range(0, len(paths), 500):
+			chunk = paths[start : start + 500]
+			placeholders = ",".join("?" * len(chunk))
+			rows = connection.execute(
+				"SELECT file_path, file_hash FROM photo_scores "
+				f"WHERE file_path IN ({placeholders})",
+				chunk,
+			)
+			for row in rows:
+				if (row[0], row[1]) in wanted:
+					present.add((row[0], row[1]))
+		return present
+
+	def get_by_stat(
+		self,
+		file_path: str,
+		mtime_ns: int,
+		size: int,
+		hash_algo: str | None = None,
+	) -> CachedScore | None:
+		"""Cheap lookup keyed on file stat, usable before any image decode."""
+		if not self._db_path.exists():
+			return None
+		row = self._fetch_row(file_path)
+		if row is None:
+			return None
+
+		if row[6] != mtime_ns or row[7] != size:
+			return None
+
+		# Rows written before the hash_algo column were always average hashes.
+		if hash_algo is not None and (row[10] or "ahash") != hash_algo:
+			return None
+
+		return self._cached_score_from_row(row)
 
 	def upsert(
 		self,
@@ -44,79 +169,308 @@ class ScoreStore:
 		score: float,
 		analysis: Dict[str, Any] | None,
 		quality: Dict[str, Any] | None,
+		*,
+		mtime_ns: int | None = None,
+		size: int | None = None,
+		width: int | None = None,
+		height: int | None = None,
+		hash_algo: str | None = None,
 	) -> None:
 		if not self._db_path.exists() and not self._create:
 			raise RuntimeError("ScoreStore is read-only")
-		payload = (
+		payload = self._upsert_payload(
+			file_path,
+			file_hash,
+			score,
+			analysis,
+			quality,
+			mtime_ns=mtime_ns,
+			size=size,
+			width=width,
+			height=height,
+			hash_algo=hash_algo,
+		)
+		connection = self._connect()
+		connection.execute(_UPSERT_SQL, payload)
+		if self._in_batch:
+			self._pending_writes += 1
+			if self._pending_writes >= BATCH_COMMIT_INTERVAL:
+				connection.commit()
+				connection.execute("BEGIN")
+				self._pending_writes = 0
+
+	def upsert_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+		"""Write many rows (keyword dicts matching upsert) in one transaction."""
+		if not self._db_path.exists() and not self._create:
+			raise RuntimeError("ScoreStore is read-only")
+		now = self._now_iso()
+		payloads = [self._upsert_payload(**row, now=now) for row in rows]
+		if not payloads:
+			return
+		connection = self._connect()
+		if self._in_batch:
+			connection.executemany(_UPSERT_SQL, payloads)
+			self._pending_writes += len(payloads)
+			return
+		connection.execute("BEGIN IMMEDIATE")
+		try:
+			connection.executemany(_UPSERT_SQL, payloads)
+			connection.commit()
+		except BaseException:
+			connection.rollback()
+			raise
+
+	def _upsert_payload(
+		self,
+		file_path: str,
+		file_hash: str,
+		score: float,
+		analysis: Dict[str, Any] | None,
+		quality: Dict[str, Any] | None,
+		*,
+		mtime_ns: int | None = None,
+		size: int | None = None,
+		width: int | None = None,
+		height: int | None = None,
+		hash_algo: str | None = None,
+		now: str | None = None,
+	) -> tuple[Any, ...]:
+		return (
 			file_path,
 			file_hash,
 			float(score),
 			self._dump_json(analysis),
 			self._dump_json(quality),
-			self._now_iso(),
+			now or self._now_iso(),
+			mtime_ns,
+			size,
+			width,
+			height,
+			hash_algo,
 		)
-		with sqlite3.connect(self._db_path) as connection:
-			connection.execute(
-				"""
-				INSERT INTO photo_scores (
-					file_path,
-					file_hash,
-					score,
-					analysis_json,
-					quality_json,
-					last_processed_at
-				)
-				VALUES (?, ?, ?, ?, ?, ?)
-				ON CONFLICT(file_path) DO UPDATE SET
-					file_hash = excluded.file_hash,
-					score = excluded.score,
-					analysis_json = excluded.analysis_json,
-					quality_json = excluded.quality_json,
-					last_processed_at = excluded.last_processed_at
-				""",
-				payload,
-			)
 
 	def _init_db(self) -> None:
 		self._db_path.parent.mkdir(parents=True, exist_ok=True)
-		with sqlite3.connect(self._db_path) as connection:
-			connection.execute(
-				"""
-				CREATE TABLE IF NOT EXISTS photo_scores (
-					file_path TEXT PRIMARY KEY,
-					file_hash TEXT NOT NULL,
-					score REAL NOT NULL,
-					analysis_json TEXT,
-					quality_json TEXT,
-					last_processed_at TEXT NOT NULL
-				)
-				"""
+		connection = self._connect()
+		connection.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS photo_scores (
+				file_path TEXT PRIMARY KEY,
+				file_hash TEXT NOT NULL,
+				score REAL NOT NULL,
+				analysis_json TEXT,
+				quality_json TEXT,
+				last_processed_at TEXT NOT NULL,
+				mtime_ns INTEGER,
+				size INTEGER,
+				width INTEGER,
+				height INTEGER,
+				hash_algo TEXT
 			)
+			"""
+		)
+		existing = {
+			row[1] for row in connection.execute("PRAGMA table_info(photo_scores)")
+		}
+		for column, column_type in (
+			("mtime_ns", "INTEGER"),
+			("size", "INTEGER"),
+			("width", "INTEGER"),
+			("height", "INTEGER"),
+			("hash_algo", "TEXT"),
+		):
+			if column not in existing:
+				connection.execute(
+					f"ALTER TABLE photo_scores ADD COLUMN {column} {column_type}"
+				)
+		# Covering index for get_many, which only reads (file_path, file_hash).
+		connection.execute(
+			"""
+			CREATE INDEX IF NOT EXISTS idx_photo_scores_path_hash
+			ON photo_scores(file_path, file_hash)
+			"""
+		)
 
 	def _fetch_row(self, file_path: str) -> tuple[Any, ...] | None:
-		with sqlite3.connect(self._db_path) as connection:
+		connection = self._connect()
+		try:
 			cursor = connection.execute(
 				"""
-				SELECT file_path, file_hash, score, analysis_json, quality_json, last_processed_at
+				SELECT file_path, file_hash, score, analysis_json, quality_json,
+					last_processed_at, mtime_ns, size, width, height, hash_algo
 				FROM photo_scores
 				WHERE file_path = ?
 				""",
 				(file_path,),
 			)
 			return cursor.fetchone()
+		except sqlite3.OperationalError:
+			# Databases written before the stat columns existed.
+			cursor = connection.execute(
+				"""
+				SELECT file_path, file_hash, score, analysis_json, quality_json,
+					last_processed_at
+				FROM photo_scores
+				WHERE file_path = ?
+				""",
+				(file_path,),
+			)
+			row = cursor.fetchone()
+			return row + (None, None, None, None, None) if row is not None else None
+
+	def _cached_score_from_row(self, row: tuple[Any, ...]) -> CachedScore:
+		return CachedScore(
+			score=float(row[2]),
+			analysis=self._load_json(row[3]),
+			quality=self._load_json(row[4]),
+			file_hash=row[1],
+			width=row[8],
+			height=row[9],
+		)
 
 	@staticmethod
 	def _dump_json(value: Dict[str, Any] | None) -> str | None:
-		if value is None:
-			return None
-		return json.dumps(value, ensure_ascii=True)
+		return _dump_json(value)
 
 	@staticmethod
 	def _load_json(value: str | None) -> Dict[str, Any] | None:
-		if not value:
-			return None
-		return json.loads(value)
+		return _load_json(value)
 
 	@staticmethod
 	def _now_iso() -> str:
-		return datetime.now(timezone.utc).isoformat(timespec="seconds")
+		return _now_iso()
+
+
+_VIDEO_UPSERT_SQL = """
+	INSERT INTO video_clip_scores (
+		source_path,
+		clip_start,
+		clip_end,
+		mtime_ns,
+		size,
+		model,
+		record_json,
+		last_processed_at
+	)
+	VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+	ON CONFLICT(source_path, clip_start, clip_end) DO UPDATE SET
+		mtime_ns = excluded.mtime_ns,
+		size = excluded.size,
+		model = excluded.model,
+		record_json = excluded.record_json,
+		last_processed_at = excluded.last_processed_at
+"""
+
+
+class VideoScoreStore:
+	"""Resume store for scored clips, keyed by (source_path, start, end).
+
+	Splitting re-creates the clip files on every run, so freshness is tied to
+	the source video's stat (mtime_ns, size) and the scoring model rather than
+	the clip file itself.
+	"""
+
+	def __init__(self, db_path: Path, create: bool = True) -> None:
+		self._db_path = db_path
+		self._create = create
+		self._connection: sqlite3.Connection | None = None
+		if create:
+			self._init_db()
+
+	def _connect(self) -> sqlite3.Connection:
+		if self._connection is None:
+			connection = sqlite3.connect(
+				self._db_path,
+				isolation_level=None,
+				check_same_thread=False,
+			)
+			connection.execute("PRAGMA journal_mode=WAL")
+			connection.execute("PRAGMA synchronous=NORMAL")
+			self._connection = connection
+		return self._connection
+
+	def close(self) -> None:
+		if self._connection is not None:
+			self._connection.close()
+			self._connection = None
+
+	def get(
+		self,
+		source_path: str,
+		start: float,
+		end: float,
+		mtime_ns: int,
+		size: int,
+		model: str,
+	) -> Dict[str, Any] | None:
+		if not self._db_path.exists():
+			return None
+		row = self._connect().execute(
+			"""
+			SELECT mtime_ns, size, model, record_json
+			FROM video_clip_scores
+			WHERE source_path = ? AND clip_start = ? AND clip_end = ?
+			""",
+			(source_path, start, end),
+		).fetchone()
+		if row is None or row[0] != mtime_ns or row[1] != size or row[2] != model:
+			return None
+		return _load_json(row[3])
+
+	def upsert_many(self, rows: Iterable[tuple[Any, ...]]) -> None:
+		"""Write (source_path, start, end, mtime_ns, size, model, record) rows."""
+		if not self._db_path.exists() and not self._create:
+			raise RuntimeError("VideoScoreStore is read-only")
+		now = _now_iso()
+		payloads = [
+			(source_path, start, end, mtime_ns, size, model, _dump_json(record), now)
+			for source_path, start, end, mtime_ns, size, model, record in rows
+		]
+		if not payloads:
+			return
+		connection = self._connect()
+		connection.execute("BEGIN IMMEDIATE")
+		try:
+			connection.executemany(_VIDEO_UPSERT_SQL, payloads)
+			connection.commit()
+		except BaseException:
+			connection.rollback()
+			raise
+
+	def _init_db(self) -> None:
+		self._db_path.parent.mkdir(parents=True, exist_ok=True)
+		self._connect().execute(
+			"""
+			CREATE TABLE IF NOT EXISTS video_clip_scores (
+				source_path TEXT NOT NULL,
+				clip_start REAL NOT NULL,
+				clip_end REAL NOT NULL,
+				mtime_ns INTEGER NOT NULL,
+				size INTEGER NOT NULL,
+				model TEXT NOT NULL,
+				record_json TEXT NOT NULL,
+				last_processed_at TEXT NOT NULL,
+				PRIMARY KEY (source_path, clip_start, clip_end)
+			)
+			"""
+		)
+
+
+def _dump_json(value: Dict[str, Any] | None) -> str | None:
+	if value is None:
+		return None
+	if orjson is not None:
+		return orjson.dumps(value).decode("utf-8")
+	return json.dumps(value, ensure_ascii=True)
+
+
+def _load_json(value: str | None) -> Dict[str, Any] | None:
+	if not value:
+		return None
+	if orjson is not None:
+		return orjson.loads(value)
+	return json.loads(value)
+
+
+def _now_iso() -> str:
+	return datetime.now(timezone.utc).isoformat(timespec="seconds")
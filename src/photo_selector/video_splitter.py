@@ -3,6 +3,7 @@ from __future__ import annotations
 import subprocess
 import json
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 VIDEO_EXTENSIONS = {".mp4", ".mov", ".mkv", ".avi", ".webm"}
@@ -78,13 +79,45 @@ def split_video(
 ) -> list[ClipInfo]:
 	output_dir.mkdir(parents=True, exist_ok=True)
 
+	# One probe of the source covers every segment: the splitter re-encodes
+	# all clips with the source's dimensions and frame rate.
+	metadata = get_video_metadata(path)
 	pattern = output_dir / "clip_%04d.mp4"
-	_command_ffmpeg_segment(path, pattern, max_clip, use_hwaccel)
+	segment_list = _command_ffmpeg_segment(path, pattern, max_clip, use_hwaccel)
+
+	segments = _parse_segment_list(segment_list)
+	if not segments:
+		return _probe_clips_fallback(path, output_dir, min_clip)
 
 	clips: list[ClipInfo] = []
-	clip_paths = sorted(output_dir.glob("clip_*.mp4"))
+	for name, seg_start, seg_end in segments:
+		duration = seg_end - seg_start
+		if duration < min_clip:
+			continue
+		clips.append(
+			ClipInfo(
+				source_path=path,
+				clip_path=output_dir / name,
+				start=seg_start,
+				end=seg_end,
+				duration=duration,
+				width=metadata.width,
+				height=metadata.height,
+				fps=metadata.fps,
+			)
+		)
+	return clips
+
+
+def _probe_clips_fallback(
+	path: Path,
+	output_dir: Path,
+	min_clip: int,
+) -> list[ClipInfo]:
+	"""Per-clip ffprobe walk, used only when the segment list is unusable."""
+	clips: list[ClipInfo] = []
 	start = 0.0
-	for clip_path in clip_paths:
+	for clip_path in sorted(output_dir.glob("clip_*.mp4")):
 		metadata = get_video_metadata(clip_path)
 		if metadata.duration < min_clip:
 			continue
@@ -107,16 +140,31 @@ def split_video(
 	return clips
 
 
+def _parse_segment_list(text: str) -> list[tuple[str, float, float]]:
+	"""Parse `filename,start,end` lines emitted by the segment muxer on stdout."""
+	segments: list[tuple[str, float, float]] = []
+	for line in text.splitlines():
+		parts = line.strip().rsplit(",", 2)
+		if len(parts) != 3:
+			continue
+		try:
+			segments.append((parts[0], float(parts[1]), float(parts[2])))
+		except ValueError:
+			continue
+	return segments
+
+
 def _command_ffmpeg_segment(
 	input_path: Path,
 	output_pattern: Path,
 	segment_time: int,
 	use_hwaccel: bool,
-) -> None:
+) -> str:
 	command = _build_segment_command(input_path, output_pattern, segment_time, use_hwaccel)
 	result = subprocess.run(command, capture_output=True, text=True, check=False)
 	if result.returncode != 0:
 		raise RuntimeError(result.stderr.strip() or "ffmpeg segment failed")
+	return result.stdout
 
 
 def _build_segment_command(
@@ -126,11 +174,13 @@ def _build_segment_command(
 	use_hwaccel: bool,
 ) -> list[str]:
 	if use_hwaccel:
-		return [
-			"ffmpeg",
-			"-y",
-			"-hwaccel",
-			"cuda",
+		# With scale_cuda available, frames stay on the GPU from decode through
+		# encode; otherwise every frame round-trips through system memory.
+		gpu_frames = ffmpeg_supports_filter("scale_cuda")
+		command = ["ffmpeg", "-y", "-hwaccel", "cuda"]
+		if gpu_frames:
+			command += ["-hwaccel_output_format", "cuda"]
+		command += [
 			"-i",
 			str(input_path),
 			"-c:v",
@@ -147,18 +197,28 @@ def _build_segment_command(
 			"20M",
 			"-bufsize",
 			"20M",
-			"-pix_fmt",
-			"yuv420p",
+		]
+		if gpu_frames:
+			command += ["-vf", "scale_cuda=format=yuv420p"]
+		else:
+			command += ["-pix_fmt", "yuv420p"]
+		return command + [
 			"-force_key_frames",
 			f"expr:gte(t,n_forced*{segment_time})",
 			"-c:a",
 			"aac",
 			"-b:a",
 			"128k",
+			"-threads",
+			"2",
 			"-f",
 			"segment",
 			"-segment_time",
 			str(segment_time),
+			"-segment_list",
+			"pipe:1",
+			"-segment_list_type",
+			"csv",
 			"-reset_timestamps",
 			"1",
 			str(output_pattern),
@@ -183,16 +243,43 @@ def _build_segment_command(
 		"aac",
 		"-b:a",
 		"128k",
+		"-threads",
+		"2",
 		"-f",
 		"segment",
 		"-segment_time",
 		str(segment_time),
+		"-segment_list",
+		"pipe:1",
+		"-segment_list_type",
+		"csv",
 		"-reset_timestamps",
 		"1",
 		str(output_pattern),
 	]
 
 
+@lru_cache(maxsize=None)
+def ffmpeg_supports_filter(name: str) -> bool:
+	"""True when the local ffmpeg build lists the given filter (e.g. scale_cuda)."""
+	try:
+		result = subprocess.run(
+			["ffmpeg", "-hide_banner", "-filters"],
+			capture_output=True,
+			text=True,
+			check=False,
+		)
+	except OSError:
+		return False
+	if result.returncode != 0:
+		return False
+	for line in result.stdout.splitlines():
+		parts = line.split()
+		if len(parts) >= 2 and parts[1] == name:
+			return True
+	return False
+
+
 def _parse_fps(value: str | None) -> float:
 	if not value or value == "0/0":
 		return 0.0
@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+# Shared hash literals for the dedupe tests; the production APIs take the
+# 16-digit hex form, so that is what the fixtures expose.
+ALL_ONES_HEX = "f" * 16
+ZERO_HEX = "0" * 16
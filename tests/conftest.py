@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import pytest
+
+
+@pytest.fixture
+def concat_harness(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+	"""Stub clip selection and staging for concat-planning tests.
+
+	Selection returns whatever the test puts into harness["selected"] /
+	harness["stats"], and the staging copy fallback becomes a no-op so clip
+	files need no real bytes. Tests that add more concat cases share these
+	stubs instead of re-installing their own monkeypatches.
+	"""
+	harness: Dict[str, Any] = {"selected": [], "stats": {}}
+
+	def fake_select(*_args: Any, **_kwargs: Any) -> tuple[Any, Any]:
+		return harness["selected"], harness["stats"]
+
+	monkeypatch.setattr(
+		"photo_selector.video_digest._select_clips_for_source", fake_select
+	)
+	monkeypatch.setattr("shutil.copyfile", lambda _src, _dst: None)
+	return harness
@@ -1,32 +1,58 @@
 from __future__ import annotations
 
+import functools
+from typing import Any, Dict
+
+import pytest
+
 from photo_selector.score_schema import normalize_analysis, parse_score_result
 
+_CLAMP_RAW = {
+	"score": "1.2",
+	"tags": "not-a-list",
+	"risks": {"blur": True},
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _normalized_clamp_result() -> Dict[str, Any]:
+	# Normalized once and shared by every field case below.
+	return normalize_analysis(dict(_CLAMP_RAW))
+
+
+@pytest.mark.parametrize(
+	("field", "expected"),
+	[
+		("overall_score", 0.0),
+		("sharpness", 0.0),
+		("subject_visibility", 0.0),
+		("composition", 0.0),
+		("duplication_penalty", 0.0),
+		("reasoning", ""),
+	],
+)
+def test_parse_score_result_defaults(field: str, expected: object) -> None:
+	assert getattr(parse_score_result({}), field) == expected
+
+
+@pytest.mark.parametrize(
+	("field", "expected"),
+	[
+		("overall_score", 1.0),
+		("score", 1.0),
+		("sharpness", 0.0),
+		("subject_visibility", 0.0),
+		("composition", 0.0),
+		("duplication_penalty", 0.0),
+		("reasoning", ""),
+	],
+)
+def test_normalize_analysis_clamps_and_maps_score(
+	field: str, expected: object
+) -> None:
+	assert _normalized_clamp_result()[field] == expected
+
 
-def test_parse_score_result_defaults() -> None:
-	result = parse_score_result({})
-	assert result.overall_score == 0.0
-	assert result.sharpness == 0.0
-	assert result.subject_visibility == 0.0
-	assert result.composition == 0.0
-	assert result.duplication_penalty == 0.0
-	assert result.reasoning == ""
-
-
-def test_normalize_analysis_clamps_and_maps_score() -> None:
-	raw = {
-		"score": "1.2",
-		"tags": "not-a-list",
-		"risks": {"blur": True},
-	}
-	analysis = normalize_analysis(raw)
-
-	assert analysis["overall_score"] == 1.0
-	assert analysis["score"] == 1.0
-	assert analysis["sharpness"] == 0.0
-	assert analysis["subject_visibility"] == 0.0
-	assert analysis["composition"] == 0.0
-	assert analysis["duplication_penalty"] == 0.0
-	assert analysis["reasoning"] == ""
-	assert isinstance(analysis["tags"], list)
-	assert isinstance(analysis["risks"], dict)
+@pytest.mark.parametrize(("field", "kind"), [("tags", list), ("risks", dict)])
+def test_normalize_analysis_coerces_types(field: str, kind: type) -> None:
+	assert isinstance(_normalized_clamp_result()[field], kind)
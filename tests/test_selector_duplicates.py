@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from photo_selector.selector import select_photos_with_dedupe
+import pytest
+
+from tests._hash_fixtures import ALL_ONES_HEX
+
+from photo_selector.dedupe_utils import HammingIndex
+from photo_selector.selector import select_photos_with_dedupe, select_top_photos
 
 
 def _photo(path: str, score: float, hash_hex: str) -> dict[str, object]:
@@ -12,16 +17,24 @@ def _photo(path: str, score: float, hash_hex: str) -> dict[str, object]:
 	}
 
 
-def test_near_duplicate_selection_prefers_high_score() -> None:
-	hash_hex = "ffffffffffffffff"
+@pytest.mark.parametrize(
+	("selector", "kwargs"),
+	[
+		(
+			select_photos_with_dedupe,
+			{"target_count": 1, "hamming_threshold": 6, "dedupe_enabled": True},
+		),
+		(select_top_photos, {"target_count": 1}),
+	],
+)
+def test_near_duplicate_selection_prefers_high_score(selector, kwargs) -> None:
+	hash_hex = ALL_ONES_HEX
 	photos = [
 		_photo("a.jpg", 0.9, hash_hex),
 		_photo("b.jpg", 0.8, hash_hex),
 	]
 
-	selected = select_photos_with_dedupe(
-		photos, target_count=1, hamming_threshold=6, dedupe_enabled=True
-	)
+	selected = selector(photos, **kwargs)
 
 	assert len(selected) == 1
 	assert selected[0]["path"] == "a.jpg"
@@ -29,8 +42,8 @@ def test_near_duplicate_selection_prefers_high_score() -> None:
 
 def test_dedupe_disabled_keeps_ordered() -> None:
 	photos = [
-		_photo("a.jpg", 0.9, "ffffffffffffffff"),
-		_photo("b.jpg", 0.8, "ffffffffffffffff"),
+		_photo("a.jpg", 0.9, ALL_ONES_HEX),
+		_photo("b.jpg", 0.8, ALL_ONES_HEX),
 	]
 
 	selected = select_photos_with_dedupe(
@@ -38,3 +51,11 @@ def test_dedupe_disabled_keeps_ordered() -> None:
 	)
 
 	assert [item["path"] for item in selected] == ["a.jpg", "b.jpg"]
+
+
+def test_hamming_index_matches_within_threshold() -> None:
+	index = HammingIndex(threshold=6)
+	index.add(0xFFFFFFFFFFFFFFFF)
+
+	assert index.within(0xFFFFFFFFFFFFFFF0)
+	assert not index.within(0x0000000000000000)
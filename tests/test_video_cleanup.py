@@ -1,24 +1,39 @@
 from __future__ import annotations
 
+import os
+import shutil
 from pathlib import Path
 
+import pytest
+
 from photo_selector.video_digest import _cleanup_temp_artifacts
 
 
-def _setup_temp_tree(tmp_path: Path) -> tuple[Path, Path, Path]:
-	output_dir = tmp_path / "output"
-	temp_dir = output_dir / "temp"
-	clip_root = temp_dir / "clips"
-	clip_dir = clip_root / "source"
+@pytest.fixture(scope="session")
+def temp_tree_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+	"""Canonical output/temp tree, built once per session."""
+	output_dir = tmp_path_factory.mktemp("cleanup_template") / "output"
+	clip_dir = output_dir / "temp" / "clips" / "source"
 	clip_dir.mkdir(parents=True)
 	(clip_dir / "clip_0001.mp4").write_text("clip", encoding="utf-8")
-	(frame_dir := temp_dir / "frames" / "source").mkdir(parents=True)
+	frame_dir = output_dir / "temp" / "frames" / "source"
+	frame_dir.mkdir(parents=True)
 	(frame_dir / "frame.jpg").write_text("frame", encoding="utf-8")
-	return output_dir, temp_dir, clip_root
+	return output_dir
+
+
+@pytest.fixture
+def temp_tree(tmp_path: Path, temp_tree_template: Path) -> tuple[Path, Path, Path]:
+	# Hardlinks clone the template into each test without copying file bytes;
+	# cleanup only unlinks the clone's entries, so the template is untouched.
+	output_dir = tmp_path / "output"
+	shutil.copytree(temp_tree_template, output_dir, copy_function=os.link)
+	temp_dir = output_dir / "temp"
+	return output_dir, temp_dir, temp_dir / "clips"
 
 
-def test_cleanup_removes_temp_when_keep_temp_false(tmp_path: Path) -> None:
-	output_dir, temp_dir, clip_root = _setup_temp_tree(tmp_path)
+def test_cleanup_removes_temp_when_keep_temp_false(temp_tree: tuple[Path, Path, Path]) -> None:
+	output_dir, temp_dir, clip_root = temp_tree
 	sources = [{"error": None}]
 	job_state = {
 		"split": {"a": {"status": "ok"}},
@@ -40,8 +55,8 @@ def test_cleanup_removes_temp_when_keep_temp_false(tmp_path: Path) -> None:
 	assert not temp_dir.exists()
 
 
-def test_cleanup_skips_when_keep_temp_true(tmp_path: Path) -> None:
-	output_dir, temp_dir, clip_root = _setup_temp_tree(tmp_path)
+def test_cleanup_skips_when_keep_temp_true(temp_tree: tuple[Path, Path, Path]) -> None:
+	output_dir, temp_dir, clip_root = temp_tree
 	sources = [{"error": None}]
 	job_state = {
 		"split": {"a": {"status": "ok"}},
@@ -63,8 +78,8 @@ def test_cleanup_skips_when_keep_temp_true(tmp_path: Path) -> None:
 	assert temp_dir.exists()
 
 
-def test_cleanup_skips_on_failure(tmp_path: Path) -> None:
-	output_dir, temp_dir, clip_root = _setup_temp_tree(tmp_path)
+def test_cleanup_skips_on_failure(temp_tree: tuple[Path, Path, Path]) -> None:
+	output_dir, temp_dir, clip_root = temp_tree
 	sources = [{"error": "boom"}]
 	job_state = {
 		"split": {"a": {"status": "failed"}},
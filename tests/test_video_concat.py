@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from photo_selector.output_paths import get_video_paths
+from photo_selector.dedupe_utils import HammingIndex
 from photo_selector.video_digest import JobContext, _process_single_source
 
 
@@ -20,40 +21,25 @@ def _record(path: Path, start: float) -> dict[str, object]:
 	}
 
 
-def test_concat_uses_selected_clips_only(tmp_path: Path, monkeypatch) -> None:
+def test_concat_uses_selected_clips_only(tmp_path: Path, concat_harness) -> None:
 	paths = get_video_paths(tmp_path)
 	source_path = tmp_path / "source.mp4"
 	source_path.write_text("source", encoding="utf-8")
 
-	clip_a = tmp_path / "a.mp4"
-	clip_b = tmp_path / "b.mp4"
-	clip_c = tmp_path / "c.mp4"
-	for clip in (clip_a, clip_b, clip_c):
-		clip.write_text("clip", encoding="utf-8")
-
-	records = [_record(clip_a, 0.0), _record(clip_b, 5.0), _record(clip_c, 10.0)]
-	selected_records = [records[1], records[2]]
-
-	def fake_select(*_args, **_kwargs):
-		stats = {
-			"total_clips": 3,
-			"selected_clips_count": 2,
-			"concatenating_count": 2,
-		}
-		return selected_records, stats
-
-	captured: dict[str, list[Path]] = {}
-
-	def fake_concat(clips, output_path, use_hwaccel, list_path):
-		captured["clips"] = list(clips)
-		captured["output"] = output_path
-		captured["list_path"] = list_path
-
-	monkeypatch.setattr("photo_selector.video_digest._select_clips_for_source", fake_select)
-	monkeypatch.setattr("photo_selector.video_digest._concat_clips_reencode", fake_concat)
-	monkeypatch.setattr("shutil.copy2", lambda _src, _dst: None)
+	# touch() is enough — nothing reads the clip bytes in this test.
+	clips = tuple(tmp_path.joinpath(f"{name}.mp4") for name in "abc")
+	for clip in clips:
+		clip.touch()
+
+	records = [_record(clip, index * 5.0) for index, clip in enumerate(clips)]
+	concat_harness["selected"] = [records[1], records[2]]
+	concat_harness["stats"] = {
+		"total_clips": 3,
+		"selected_clips_count": 2,
+		"concatenating_count": 2,
+	}
 
-	_process_single_source(
+	_result, concat_jobs = _process_single_source(
 		str(source_path),
 		records,
 		paths=paths,
@@ -67,12 +53,8 @@ def test_concat_uses_selected_clips_only(tmp_path: Path, monkeypatch) -> None:
 		dedupe_scope="per_source_video",
 		max_selected_clips=20,
 		target_digest_seconds=90,
-		shared_hashes=[],
+		shared_index=HammingIndex(6),
 	)
 
-	selected_dir = paths.digest_clips_dir / source_path.stem
-	expected = [
-		selected_dir / "clip_0001.mp4",
-		selected_dir / "clip_0002.mp4",
-	]
-	assert captured["clips"] == expected
+	assert len(concat_jobs) == 1
+	assert concat_jobs[0].clips == [clips[1], clips[2]]
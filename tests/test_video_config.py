@@ -1,89 +1,58 @@
 from __future__ import annotations
 
+import dataclasses
 from pathlib import Path
-from types import SimpleNamespace
+
+import pytest
 
 from photo_selector.video_cli import _apply_config
 
+BASE_CONFIG = {
+	"model": "test",
+	"base_url": "http://localhost:11434",
+	"input": "in",
+	"output": "out",
+	"max_source_seconds": 10,
+}
 
-def _base_args(config_path: Path):
-	return SimpleNamespace(
-		config=str(config_path),
-		model=None,
-		ollama_base_url=None,
-		preset=None,
-		use_hwaccel=False,
-		concat_in_digest_folder=False,
-		keep_temp=False,
-		delete_split_files=False,
-		max_source_seconds=None,
-		input=None,
-		output=None,
-		video_dedupe=None,
-		video_dedupe_hamming_threshold=None,
-		video_dedupe_scope=None,
-		video_max_selected_clips=None,
-		video_target_digest_seconds=None,
-	)
 
+def _use_config(monkeypatch: pytest.MonkeyPatch, overrides: dict[str, object]) -> None:
+	"""Feed _apply_config a pre-parsed mapping, skipping the YAML write/parse."""
+	config = {**BASE_CONFIG, **overrides}
+	monkeypatch.setattr("photo_selector.video_cli.load_config", lambda _path: config)
 
-def test_config_top_level_concat_enables(tmp_path: Path) -> None:
-	config_path = tmp_path / "config.yaml"
-	config_path.write_text(
-		"""
-model: test
-base_url: http://localhost:11434
-input: in
-output: out
-max_source_seconds: 10
-concat_in_digest_folder: true
-""".strip(),
-		encoding="utf-8",
-	)
-	args = _base_args(config_path)
-	_apply_config(args)
-	assert args.concat_in_digest_folder is True
 
+@dataclasses.dataclass(slots=True)
+class _VideoArgs:
+	"""Just the argparse attributes _apply_config reads and writes."""
 
-def test_config_nested_concat_enables(tmp_path: Path) -> None:
-	config_path = tmp_path / "config.yaml"
-	config_path.write_text(
-		"""
-model: test
-base_url: http://localhost:11434
-input: in
-output: out
-max_source_seconds: 10
-video:
-  concat_in_digest_folder: true
-""".strip(),
-		encoding="utf-8",
-	)
-	args = _base_args(config_path)
-	_apply_config(args)
-	assert args.concat_in_digest_folder is True
+	config: str = "config.yaml"
+	model: str | None = None
+	ollama_base_url: str | None = None
+	preset: str | None = None
+	use_hwaccel: bool = False
+	concat_in_digest_folder: bool = False
+	keep_temp: bool = False
+	delete_split_files: bool = False
+	max_source_seconds: int | None = None
+	input: str | None = None
+	output: str | None = None
+	video_dedupe: bool | None = None
+	video_dedupe_hamming_threshold: int | None = None
+	video_dedupe_scope: str | None = None
+	video_max_selected_clips: int | None = None
+	video_target_digest_seconds: int | None = None
 
 
-def test_cli_concat_overrides_config(tmp_path: Path) -> None:
-	config_path = tmp_path / "config.yaml"
-	config_path.write_text(
-		"""
-model: test
-base_url: http://localhost:11434
-input: in
-output: out
-max_source_seconds: 10
-concat_in_digest_folder: false
-""".strip(),
-		encoding="utf-8",
-	)
-	args = _base_args(config_path)
-	args.concat_in_digest_folder = True
-	_apply_config(args)
-	assert args.concat_in_digest_folder is True
+_BASE_ARGS = _VideoArgs()
+
 
+def _base_args() -> _VideoArgs:
+	return dataclasses.replace(_BASE_ARGS)
 
-def test_config_nested_delete_split_files_enables(tmp_path: Path) -> None:
+
+def test_config_top_level_concat_enables(tmp_path: Path) -> None:
+	# The one test that exercises the real YAML loader end to end.
 	config_path = tmp_path / "config.yaml"
 	config_path.write_text(
 		"""
@@ -92,48 +61,39 @@ base_url: http://localhost:11434
 input: in
 output: out
 max_source_seconds: 10
-video:
-  delete_split_files: true
+concat_in_digest_folder: true
 """.strip(),
 		encoding="utf-8",
 	)
-	args = _base_args(config_path)
+	args = _base_args()
+	args.config = str(config_path)
 	_apply_config(args)
-	assert args.delete_split_files is True
+	assert args.concat_in_digest_folder is True
 
 
-def test_config_top_level_delete_split_files_enables(tmp_path: Path) -> None:
-	config_path = tmp_path / "config.yaml"
-	config_path.write_text(
-		"""
-model: test
-base_url: http://localhost:11434
-input: in
-output: out
-max_source_seconds: 10
-delete_split_files: true
-""".strip(),
-		encoding="utf-8",
-	)
-	args = _base_args(config_path)
+@pytest.mark.parametrize(
+	("key", "location"),
+	[
+		("concat_in_digest_folder", "top"),
+		("concat_in_digest_folder", "nested"),
+		("delete_split_files", "top"),
+		("delete_split_files", "nested"),
+	],
+)
+def test_config_enables(
+	monkeypatch: pytest.MonkeyPatch, key: str, location: str
+) -> None:
+	overrides = {"video": {key: True}} if location == "nested" else {key: True}
+	_use_config(monkeypatch, overrides)
+	args = _base_args()
 	_apply_config(args)
-	assert args.delete_split_files is True
+	assert getattr(args, key) is True
 
 
-def test_cli_delete_split_files_overrides_config(tmp_path: Path) -> None:
-	config_path = tmp_path / "config.yaml"
-	config_path.write_text(
-		"""
-model: test
-base_url: http://localhost:11434
-input: in
-output: out
-max_source_seconds: 10
-delete_split_files: false
-""".strip(),
-		encoding="utf-8",
-	)
-	args = _base_args(config_path)
-	args.delete_split_files = True
+@pytest.mark.parametrize("key", ["concat_in_digest_folder", "delete_split_files"])
+def test_cli_overrides_config(monkeypatch: pytest.MonkeyPatch, key: str) -> None:
+	_use_config(monkeypatch, {key: False})
+	args = _base_args()
+	setattr(args, key, True)
 	_apply_config(args)
-	assert args.delete_split_files is True
+	assert getattr(args, key) is True
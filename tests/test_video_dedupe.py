@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import numpy as np
+
+from tests._hash_fixtures import ALL_ONES_HEX
+
+from photo_selector.dedupe_utils import HammingIndex
 from photo_selector.video_digest import _select_clips_for_source
 
 
@@ -16,8 +21,8 @@ def _record(path: str, score: float, duration: float, frame_hash: str) -> dict[s
 
 def test_video_dedupe_keeps_best_scoring_clip() -> None:
 	records = [
-		_record("a.mp4", 0.9, 5.0, "ffffffffffffffff"),
-		_record("b.mp4", 0.8, 5.0, "ffffffffffffffff"),
+		_record("a.mp4", 0.9, 5.0, ALL_ONES_HEX),
+		_record("b.mp4", 0.8, 5.0, ALL_ONES_HEX),
 	]
 
 	selected, stats = _select_clips_for_source(
@@ -27,7 +32,7 @@ def test_video_dedupe_keeps_best_scoring_clip() -> None:
 		target_digest_seconds=90,
 		dedupe_enabled=True,
 		hamming_threshold=6,
-		existing_hashes=[],
+		existing_index=HammingIndex(6),
 	)
 	assert len(selected) == 1
 	assert selected[0]["clip_path"] == "a.mp4"
@@ -38,7 +43,7 @@ def test_video_dedupe_keeps_best_scoring_clip() -> None:
 
 def test_video_caps_limit_selection() -> None:
 	records = [
-		_record("a.mp4", 0.9, 50.0, "ffffffffffffffff"),
+		_record("a.mp4", 0.9, 50.0, ALL_ONES_HEX),
 		_record("b.mp4", 0.8, 50.0, "0f0f0f0f0f0f0f0f"),
 		_record("c.mp4", 0.7, 50.0, "f0f0f0f0f0f0f0f0"),
 	]
@@ -49,7 +54,37 @@ def test_video_caps_limit_selection() -> None:
 		target_digest_seconds=60,
 		dedupe_enabled=False,
 		hamming_threshold=6,
-		existing_hashes=[],
+		existing_index=HammingIndex(6),
 	)
 	assert len(selected) == 1
 	assert stats["total_selected_seconds"] == 50.0
+
+
+def test_video_dedupe_large_batch_uses_vectorized_hamming() -> None:
+	# 1000 random 64-bit hashes are essentially never within 6 bits of each
+	# other, so only the deliberate 1-bit variants should be removed.
+	rng = np.random.default_rng(0)
+	base = rng.integers(0, 2**64, size=1000, dtype=np.uint64)
+	near = base[:200] ^ np.uint64(1)
+
+	records = [
+		_record(f"base_{index}.mp4", 0.9, 1.0, f"{int(value):016x}")
+		for index, value in enumerate(base)
+	]
+	records += [
+		_record(f"near_{index}.mp4", 0.1, 1.0, f"{int(value):016x}")
+		for index, value in enumerate(near)
+	]
+
+	selected, stats = _select_clips_for_source(
+		records,
+		max_source_seconds=5000,
+		max_selected_clips=1200,
+		target_digest_seconds=5000,
+		dedupe_enabled=True,
+		hamming_threshold=6,
+		existing_index=HammingIndex(6),
+	)
+	assert stats["removed_duplicates"] == 200
+	assert len(selected) == 1000
+	assert all(record["clip_path"].startswith("base_") for record in selected)